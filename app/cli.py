@@ -17,6 +17,10 @@ def main():
         print("Setting up paths...")
         print("Importing UI...")
         
+        from app.core.config import configure_logging
+
+        configure_logging()
+
         # Import and run the application directly
         from app.ui.welcome_screen import WelcomeApp
 
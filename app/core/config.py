@@ -2,7 +2,11 @@
 Application configuration management.
 """
 
+import atexit
+import logging
+import logging.handlers
 import os
+import queue
 from pathlib import Path
 from typing import Optional
 from pydantic_settings import BaseSettings
@@ -66,3 +70,44 @@ settings = type(
     (),
     {"__getattr__": lambda self, name: getattr(_get_settings_cached(), name)},
 )()
+
+
+# Listener writing the records queued by configure_logging
+_log_listener = None
+
+
+def _get_default_log_path() -> Path:
+    """Get default log file path next to the database directory."""
+    log_dir = Path.home() / "boot-hn" / "temp" / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir / "app.log"
+
+
+def configure_logging(level: int = logging.WARNING) -> None:
+    """
+    Send log records through a queue to a file handler on a background
+    thread, so logging calls never block and never draw over the UI.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    try:
+        handler = logging.FileHandler(
+            _get_default_log_path(), encoding="utf-8", delay=True
+        )
+    except OSError:
+        # No writable log location; drop records rather than use the terminal
+        handler = logging.NullHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(log_queue, handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
@@ -2,9 +2,10 @@
 Database configuration and session management.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from typing import Generator
 
 # Create base class for models
@@ -14,6 +15,38 @@ Base = declarative_base()
 _engine = None
 _SessionLocal = None
 
+# Run on every new SQLite connection. WAL with synchronous=NORMAL syncs at
+# checkpoints instead of on every commit, which the many small commits of
+# the models otherwise pay for
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Pool for file-backed SQLite engines. A pooled connection can be checked
+# out by another thread than the one that opened it, which is why SQLite
+# connections are made with check_same_thread=False
+_SQLITE_POOL_ARGS = {
+    "poolclass": QueuePool,
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 def get_engine():
     """Get database engine, creating it if it doesn't exist."""
@@ -23,13 +56,19 @@ def get_engine():
 
         settings = get_settings()
 
+        engine_args = {}
+        if "sqlite" in settings.database_url:
+            engine_args["connect_args"] = {"check_same_thread": False, "timeout": 30}
+            if ":memory:" not in settings.database_url:
+                # Keep file connections open between sessions, so each one
+                # opens the database, its WAL files and the pragmas only once
+                engine_args.update(_SQLITE_POOL_ARGS)
+
         _engine = create_engine(
-            settings.database_url,
-            echo=settings.database_echo,
-            connect_args={"check_same_thread": False}
-            if "sqlite" in settings.database_url
-            else {},
+            settings.database_url, echo=settings.database_echo, **engine_args
         )
+        if _engine.dialect.name == "sqlite":
+            event.listen(_engine, "connect", _set_sqlite_pragmas)
     return _engine
 
 
@@ -53,12 +92,18 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def create_tables():
-    """Create all database tables."""
-    engine = get_engine()
+def create_tables(bind=None):
+    """Create all database tables, on bind if given, else on the engine."""
+    engine = bind if bind is not None else get_engine()
 
     # Import all models here to ensure they're registered
     from app.models.user import User, UserSettings
     from app.models.agent import AgentSession, AgentMessage
 
     Base.metadata.create_all(bind=engine)
+
+    # create_all only builds indexes along with new tables; add any index
+    # declared since an existing table was created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -4,78 +4,313 @@ All functions return strings as they will be passed to the AI agent.
 """
 
 import ast
+import hashlib
+import json
+import mmap
+import multiprocessing
 import os
 import re
+import sqlite3
+import sys
+from array import array
+from bisect import bisect_right
 from pathlib import Path
-from typing import List, Dict, Set, Any, Optional
+from typing import (
+    List,
+    Dict,
+    FrozenSet,
+    Set,
+    Any,
+    Optional,
+    Tuple,
+    Union,
+)
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from app.functions.fileio import decode_text, open_buffer
+from app.functions.paths import resolve_project_paths
+from app.functions.patterns import required_literal, spans_lines
+
+try:
+    import hyperscan
+except ImportError:  # Optional: multi-pattern scanning falls back to re
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:  # Optional: cached analyses fall back to the json module
+    orjson = None
+
+# Standard library module names (complete on Python 3.10+, common subset before)
+_PY_STDLIB = frozenset(
+    getattr(sys, "stdlib_module_names", None)
+    or {
+        "os",
+        "sys",
+        "json",
+        "urllib",
+        "http",
+        "datetime",
+        "time",
+        "re",
+        "collections",
+        "itertools",
+        "functools",
+        "pathlib",
+        "subprocess",
+        "threading",
+        "multiprocessing",
+        "asyncio",
+        "logging",
+        "unittest",
+        "sqlite3",
+        "csv",
+        "xml",
+        "html",
+        "email",
+        "base64",
+        "hashlib",
+    }
+)
+
+# Persistent cache of PythonCodeAnalyzer results keyed by (path, kind); an entry
+# is only valid for the SHA-256 of the content it was computed from. Kinds are
+# "full" (analyze) and "counts" (count_only). Results are stored as JSON, so
+# their arrays and tuples read back as lists.
+_ANALYSIS_CACHE_PATH = (
+    Path.home() / "boot-hn" / "temp" / "cache" / "code_analysis.sqlite"
+)
+_ANALYSIS_CACHE_VERSION = 3
+_analysis_cache = None
+
+# Whitespace-only and comment lines; [^\S\n] is whitespace other than newline
+_BLANK_LINE_RE = re.compile(r"^[^\S\n]*$", re.MULTILINE)
+_COMMENT_LINE_RE = re.compile(r"^[^\S\n]*#", re.MULTILINE)
+
+# Below this many uncached Python files, process start-up costs more than it saves
+_PARALLEL_ANALYSIS_MIN_FILES = 32
+
+
+def _get_analysis_cache() -> Optional[sqlite3.Connection]:
+    """Get the analysis cache connection, creating the database if needed."""
+    global _analysis_cache
+    if _analysis_cache is None:
+        try:
+            _ANALYSIS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(_ANALYSIS_CACHE_PATH), check_same_thread=False)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_results (
+                    path TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    sha256 BLOB NOT NULL,
+                    version INTEGER NOT NULL,
+                    analysis BLOB NOT NULL,
+                    PRIMARY KEY (path, kind)
+                )
+                """
+            )
+            _analysis_cache = conn
+        except sqlite3.Error:
+            return None
+    return _analysis_cache
+
+
+def _load_cached_analysis(path: str, digest: bytes, kind: str = "full") -> Any:
+    """Return a cached result for this exact file content, or None."""
+    conn = _get_analysis_cache()
+    if conn is None:
+        return None
+
+    try:
+        row = conn.execute(
+            "SELECT analysis FROM analysis_results "
+            "WHERE path = ? AND kind = ? AND sha256 = ? AND version = ?",
+            (path, kind, digest, _ANALYSIS_CACHE_VERSION),
+        ).fetchone()
+        if row is None:
+            return None
+        if orjson is not None:
+            return orjson.loads(row[0])
+        return json.loads(row[0])
+    except (sqlite3.Error, ValueError):
+        # Unreadable entries are cache misses and get overwritten
+        return None
+
+
+def _store_cached_analysis(
+    path: str, digest: bytes, analysis: Any, kind: str = "full"
+):
+    """Store a result, replacing any entry computed from older content."""
+    conn = _get_analysis_cache()
+    if conn is None:
+        return
+
+    # array("i") fields are written as lists
+    if orjson is not None:
+        data = orjson.dumps(analysis, default=list)
+    else:
+        data = json.dumps(analysis, default=list).encode("utf-8")
+
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_results VALUES (?, ?, ?, ?, ?)",
+                (
+                    path,
+                    kind,
+                    digest,
+                    _ANALYSIS_CACHE_VERSION,
+                    data,
+                ),
+            )
+    except sqlite3.Error:
+        pass
 
 
-def resolve_project_path(input_path: str, project_root: str = None) -> Path:
+def _scan_code_files(
+    root: str, extensions: FrozenSet[str]
+) -> List[Tuple[int, str, int, str]]:
     """
-    Resolve a path relative to the project root, handling various input formats.
+    Walk a directory tree once with os.scandir, collecting matching files.
 
-    Args:
-        input_path: Input path that can be:
-                   - Absolute system path (/Users/name/project/file.py)
-                   - Relative to project root (/src/main.py -> project_root/src/main.py)
-                   - Relative path (src/main.py -> project_root/src/main.py)
-                   - Current directory (. or empty)
-        project_root: Project root directory (uses current dir if None)
+    extensions must be lowercase; suffixes are matched case-insensitively.
+    Returns (inode, path, size, extension) tuples for regular files.
+    Symlinked directories are not descended into, matching rglob.
+    """
+    found = []
+    pending = [root]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                            continue
+
+                        name = entry.name
+                        dot = name.rfind(".")
+                        if dot < 0:
+                            continue
+                        ext = name[dot:]
+                        if ext not in extensions:
+                            # Most suffixes are already lowercase; only fold
+                            # case when the exact one doesn't match
+                            ext = ext.lower()
+                            if ext not in extensions:
+                                continue
+
+                        if entry.is_file():
+                            found.append(
+                                (entry.inode(), entry.path, entry.stat().st_size, ext)
+                            )
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return found
+
+
+def _read_source_bytes(file_path: str) -> bytes:
+    """Read a whole file as bytes, hinting sequential access to the kernel."""
+    with open(file_path, "rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        return f.read()
 
-    Returns:
-        Path object with resolved path
+
+def _parse_source(data: Union[bytes, mmap.mmap], filename: str) -> ast.AST:
     """
-    # First resolve the project_root itself using the same logic
-    if project_root:
-        project_root = project_root.strip()
+    Parse Python source straight from bytes, letting the tokenizer decode it.
 
-        # Handle empty or current directory for project_root
-        if not project_root or project_root == "." or project_root == "./":
-            base_path = Path.cwd().resolve()
-        else:
-            root_path_obj = Path(project_root)
-
-            # Apply same logic to project_root
-            if root_path_obj.is_absolute():
-                # Check if it's a real absolute system path
-                if len(root_path_obj.parts) > 2 and (
-                    root_path_obj.exists()
-                    or str(root_path_obj).startswith(("/", "C:", "D:"))
-                ):
-                    base_path = root_path_obj.resolve()
-                else:
-                    # Treat as relative to current directory (remove leading slash)
-                    relative_part = str(root_path_obj).lstrip("/")
-                    base_path = (Path.cwd() / relative_part).resolve()
-            else:
-                # Regular relative path
-                base_path = (Path.cwd() / project_root).resolve()
-    else:
-        base_path = Path.cwd().resolve()
+    Files with invalid UTF-8 are retried on a lenient decode, matching how
+    they are read elsewhere in this module.
+    """
+    try:
+        return ast.parse(data, filename=filename)
+    except SyntaxError as e:
+        if not str(e.msg).startswith("(unicode error)"):
+            raise
+        return ast.parse(decode_text(data), filename=filename)
+
+
+def _analyze_python_source(
+    full_path: Path, data: Union[bytes, mmap.mmap]
+) -> Dict[str, Any]:
+    """
+    Run PythonCodeAnalyzer on a file's raw bytes, reusing cached results.
+
+    The cache key is hashed straight from the buffer and a cache miss parses
+    it without decoding to str first.
+
+    Raises SyntaxError if the content cannot be parsed.
+    """
+    key = str(full_path)
+    digest = hashlib.sha256(data).digest()
+
+    analysis = _load_cached_analysis(key, digest)
+    if analysis is None:
+        tree = _parse_source(data, key)
+        analysis = PythonCodeAnalyzer().analyze(tree)
+        _store_cached_analysis(key, digest, analysis)
+    return analysis
 
-    input_path = input_path.strip()
 
-    # Handle empty or current directory for input_path
-    if not input_path or input_path == "." or input_path == "./":
-        return base_path
+def _count_python_job(job: Tuple[str, bytes]) -> Optional[Tuple[int, int]]:
+    """Process-pool worker: count one file's functions and classes, or None."""
+    key, data = job
+    try:
+        return PythonCodeAnalyzer.count_only(_parse_source(data, key))
+    except Exception:
+        return None
+
 
-    path_obj = Path(input_path)
+def _count_python_sources(
+    sources: List[Tuple[str, bytes]]
+) -> List[Optional[Tuple[int, int]]]:
+    """
+    Count functions and classes in many Python files, in parallel when worthwhile.
 
-    # Check if it's a real absolute system path (has multiple parts and exists or looks like system path)
-    if path_obj.is_absolute():
-        # If it starts with system root and has multiple parts, treat as absolute
-        if len(path_obj.parts) > 2 and (
-            path_obj.exists() or str(path_obj).startswith(("/", "C:", "D:"))
-        ):
-            return path_obj.resolve()
+    Cached results are served from the parent process; only cache misses are
+    sent to workers, and their results are written back to the cache here.
+    Files that fail to parse yield None.
+    """
+    results: List[Optional[Tuple[int, int]]] = [None] * len(sources)
+    misses = []
+    for index, (key, data) in enumerate(sources):
+        digest = hashlib.sha256(data).digest()
+        cached = _load_cached_analysis(key, digest, "counts")
+        if cached is not None:
+            results[index] = cached
         else:
-            # Treat as relative to project root (remove leading slash)
-            relative_part = str(path_obj).lstrip("/")
-            return (base_path / relative_part).resolve()
-    else:
-        # Regular relative path
-        return (base_path / input_path).resolve()
+            misses.append((index, key, digest, data))
+
+    jobs = [(key, data) for _, key, _, data in misses]
+    counts = None
+    if len(jobs) >= _PARALLEL_ANALYSIS_MIN_FILES and (os.cpu_count() or 1) > 1:
+        try:
+            # Spawned, not forked: the app runs other threads whose held
+            # locks a forked child would inherit
+            with ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                counts = list(executor.map(_count_python_job, jobs, chunksize=16))
+        except (OSError, RuntimeError):
+            # No usable process pool here (sandbox, broken worker); stay serial
+            counts = None
+    if counts is None:
+        counts = [_count_python_job(job) for job in jobs]
+
+    for (index, key, digest, _), count in zip(misses, counts):
+        if count is not None:
+            _store_cached_analysis(key, digest, count, "counts")
+            results[index] = count
+    return results
 
 
 def analyze_python_file(file_path: str, project_root: str = None) -> str:
@@ -90,7 +325,7 @@ def analyze_python_file(file_path: str, project_root: str = None) -> str:
         String with detailed analysis
     """
     try:
-        full_path = resolve_project_path(file_path, project_root)
+        full_path, base_path = resolve_project_paths(file_path, project_root)
 
         if not full_path.exists():
             return f"Error: File '{full_path}' does not exist"
@@ -101,89 +336,86 @@ def analyze_python_file(file_path: str, project_root: str = None) -> str:
         if full_path.suffix.lower() != ".py":
             return f"Error: '{full_path}' is not a Python file"
 
-        with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
-
-        # Parse AST
-        try:
-            tree = ast.parse(content, filename=str(full_path))
-        except SyntaxError as e:
-            return f"Syntax Error in {full_path}: {e}"
-
-        # Analyze structure
-        analyzer = PythonCodeAnalyzer()
-        analysis = analyzer.analyze(tree, content)
+        with open_buffer(full_path) as data:
+            content = decode_text(data)
 
-        # Show relative path for cleaner output
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
+            # Parse and analyze structure (cached by content hash)
+            try:
+                analysis = _analyze_python_source(full_path, data)
+            except SyntaxError as e:
+                return f"Syntax Error in {full_path}: {e}"
 
         try:
             display_path = full_path.relative_to(base_path)
         except ValueError:
             display_path = full_path
 
-        result = f"Python Code Analysis: {display_path}\n"
-        result += "=" * 50 + "\n\n"
+        parts = []
+        append = parts.append
+        append(f"Python Code Analysis: {display_path}\n")
+        append("=" * 50 + "\n\n")
 
         # File metrics
-        lines = content.split("\n")
-        result += f"📊 File Metrics:\n"
-        result += f"  Lines of code: {len(lines)}\n"
-        result += f"  File size: {len(content)} characters\n"
-        result += f"  Blank lines: {sum(1 for line in lines if not line.strip())}\n"
-        result += f"  Comment lines: {sum(1 for line in lines if line.strip().startswith('#'))}\n\n"
+        append(f"📊 File Metrics:\n")
+        append(f"  Lines of code: {_count_lines(content)}\n")
+        append(f"  File size: {len(content)} characters\n")
+        append(f"  Blank lines: {_count_blank_lines(content)}\n")
+        append(f"  Comment lines: {len(_COMMENT_LINE_RE.findall(content))}\n\n")
 
         # Structure analysis
-        result += f"🏗️  Code Structure:\n"
-        result += f"  Functions: {len(analysis['functions'])}\n"
-        result += f"  Classes: {len(analysis['classes'])}\n"
-        result += f"  Imports: {len(analysis['imports'])}\n"
-        result += f"  Global variables: {len(analysis['globals'])}\n\n"
+        append(f"🏗️  Code Structure:\n")
+        append(f"  Functions: {len(analysis['function_names'])}\n")
+        append(f"  Classes: {len(analysis['class_names'])}\n")
+        append(f"  Imports: {len(analysis['imports'])}\n")
+        append(f"  Global variables: {len(analysis['globals'])}\n\n")
 
         # Detailed breakdown
         if analysis["imports"]:
-            result += f"📦 Imports:\n"
+            append(f"📦 Imports:\n")
             for imp in analysis["imports"][:10]:  # Show first 10
-                result += f"  - {imp}\n"
+                append(f"  - {imp}\n")
             if len(analysis["imports"]) > 10:
-                result += f"  ... and {len(analysis['imports']) - 10} more\n"
-            result += "\n"
-
-        if analysis["classes"]:
-            result += f"🏛️  Classes:\n"
-            for cls in analysis["classes"]:
-                result += f"  - {cls['name']} (line {cls['line']}, {cls['methods']} methods)\n"
-            result += "\n"
-
-        if analysis["functions"]:
-            result += f"⚙️  Functions:\n"
-            for func in analysis["functions"][:10]:  # Show first 10
-                result += (
-                    f"  - {func['name']}() (line {func['line']}, {func['args']} args)\n"
-                )
-            if len(analysis["functions"]) > 10:
-                result += f"  ... and {len(analysis['functions']) - 10} more\n"
-            result += "\n"
+                append(f"  ... and {len(analysis['imports']) - 10} more\n")
+            append("\n")
+
+        if analysis["class_names"]:
+            append(f"🏛️  Classes:\n")
+            for name, line, methods in zip(
+                analysis["class_names"],
+                analysis["class_lines"],
+                analysis["class_methods"],
+            ):
+                append(f"  - {name} (line {line}, {methods} methods)\n")
+            append("\n")
+
+        if analysis["function_names"]:
+            append(f"⚙️  Functions:\n")
+            for name, line, args in zip(
+                analysis["function_names"][:10],  # Show first 10
+                analysis["function_lines"],
+                analysis["function_args"],
+            ):
+                append(f"  - {name}() (line {line}, {args} args)\n")
+            if len(analysis["function_names"]) > 10:
+                append(f"  ... and {len(analysis['function_names']) - 10} more\n")
+            append("\n")
 
         # Complexity analysis
-        result += f"⚡ Complexity Analysis:\n"
-        result += (
+        append(f"⚡ Complexity Analysis:\n")
+        append(
             f"  Average function length: {analysis['avg_function_length']:.1f} lines\n"
         )
-        result += f"  Max function length: {analysis['max_function_length']} lines\n"
-        result += f"  Cyclomatic complexity: {analysis['cyclomatic_complexity']}\n\n"
+        append(f"  Max function length: {analysis['max_function_length']} lines\n")
+        append(f"  Cyclomatic complexity: {analysis['cyclomatic_complexity']}\n\n")
 
         # Code quality insights
         if analysis["insights"]:
-            result += f"💡 Code Quality Insights:\n"
+            append(f"💡 Code Quality Insights:\n")
             for insight in analysis["insights"]:
-                result += f"  - {insight}\n"
-            result += "\n"
+                append(f"  - {insight}\n")
+            append("\n")
 
-        return result
+        return "".join(parts)
 
     except Exception as e:
         return f"Error analyzing Python file '{file_path}': {str(e)}"
@@ -204,7 +436,7 @@ def analyze_directory_code(
         String with directory code analysis
     """
     try:
-        search_path = resolve_project_path(directory, project_root)
+        search_path, base_path = resolve_project_paths(directory, project_root)
 
         if not search_path.exists():
             return f"Error: Directory '{search_path}' does not exist"
@@ -215,27 +447,23 @@ def analyze_directory_code(
         if file_extensions is None:
             file_extensions = [".py", ".js", ".ts", ".jsx", ".tsx"]
 
-        # Get base path for relative display
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
-
         try:
             display_path = search_path.relative_to(base_path)
         except ValueError:
             display_path = search_path
 
-        result = f"Code Analysis for Directory: {display_path}\n"
-        result += "=" * 50 + "\n\n"
+        parts = []
+        append = parts.append
+        append(f"Code Analysis for Directory: {display_path}\n")
+        append("=" * 50 + "\n\n")
 
-        # Collect files
-        code_files = []
-        for ext in file_extensions:
-            code_files.extend(search_path.rglob(f"*{ext}"))
-
-        if not code_files:
+        # Collect files in one walk, then read in inode order, which keeps disk
+        # access close to sequential when the page cache is cold
+        ext_set = frozenset(ext.lower() for ext in file_extensions)
+        code_entries = _scan_code_files(str(search_path), ext_set)
+        if not code_entries:
             return f"No code files found in directory '{search_path}'"
+        code_entries.sort(key=lambda entry: entry[0])
 
         # Analyze each file type
         stats_by_ext = defaultdict(
@@ -250,71 +478,69 @@ def analyze_directory_code(
         )
 
         total_files = 0
-        for file_path in code_files:
-            if not file_path.is_file():
-                continue
-
-            ext = file_path.suffix.lower()
-            file_size = file_path.stat().st_size
+        python_sources = []
+        # Plain string operations in the per-file loop; pathlib is much slower
+        base_prefix = os.path.join(str(base_path), "")
+        for _, file_path, file_size, ext in code_entries:
 
             try:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                    lines = len(content.split("\n"))
+                # Line counts work on raw bytes; only Python files on a cache
+                # miss are ever decoded
+                data = _read_source_bytes(file_path)
+                lines = _count_lines(data)
 
                 # Basic analysis
                 stats_by_ext[ext]["count"] += 1
                 stats_by_ext[ext]["total_lines"] += lines
                 stats_by_ext[ext]["total_size"] += file_size
 
-                try:
-                    relative_path = file_path.relative_to(base_path)
-                except ValueError:
+                if file_path.startswith(base_prefix):
+                    relative_path = file_path[len(base_prefix) :]
+                else:
                     relative_path = file_path
 
-                stats_by_ext[ext]["files"].append(str(relative_path))
+                stats_by_ext[ext]["files"].append(relative_path)
 
-                # Language-specific analysis
+                # Language-specific analysis is batched below
                 if ext == ".py":
-                    try:
-                        tree = ast.parse(content)
-                        analyzer = PythonCodeAnalyzer()
-                        analysis = analyzer.analyze(tree, content)
-                        stats_by_ext[ext]["functions"] += len(analysis["functions"])
-                        stats_by_ext[ext]["classes"] += len(analysis["classes"])
-                    except:
-                        pass
+                    python_sources.append((file_path, data))
 
                 total_files += 1
 
             except Exception:
                 continue
 
+        # Only function and class totals are reported, so skip the full analysis
+        for count in _count_python_sources(python_sources):
+            if count is not None:
+                stats_by_ext[".py"]["functions"] += count[0]
+                stats_by_ext[".py"]["classes"] += count[1]
+
         # Generate report
-        result += f"📊 Summary:\n"
-        result += f"  Total code files: {total_files}\n"
-        result += f"  File types: {len(stats_by_ext)}\n\n"
+        append(f"📊 Summary:\n")
+        append(f"  Total code files: {total_files}\n")
+        append(f"  File types: {len(stats_by_ext)}\n\n")
 
         for ext, stats in sorted(stats_by_ext.items()):
             if stats["count"] == 0:
                 continue
 
-            result += f"📄 {ext.upper()} Files:\n"
-            result += f"  Count: {stats['count']}\n"
-            result += f"  Total lines: {stats['total_lines']}\n"
-            result += f"  Average lines per file: {stats['total_lines'] / stats['count']:.1f}\n"
-            result += f"  Total size: {format_file_size(stats['total_size'])}\n"
+            append(f"📄 {ext.upper()} Files:\n")
+            append(f"  Count: {stats['count']}\n")
+            append(f"  Total lines: {stats['total_lines']}\n")
+            append(f"  Average lines per file: {stats['total_lines'] / stats['count']:.1f}\n")
+            append(f"  Total size: {format_file_size(stats['total_size'])}\n")
 
             if ext == ".py" and (stats["functions"] > 0 or stats["classes"] > 0):
-                result += f"  Functions: {stats['functions']}\n"
-                result += f"  Classes: {stats['classes']}\n"
+                append(f"  Functions: {stats['functions']}\n")
+                append(f"  Classes: {stats['classes']}\n")
 
-            result += f"  Files: {', '.join(stats['files'][:5])}"
+            append(f"  Files: {', '.join(stats['files'][:5])}")
             if len(stats["files"]) > 5:
-                result += f" (and {len(stats['files']) - 5} more)"
-            result += "\n\n"
+                append(f" (and {len(stats['files']) - 5} more)")
+            append("\n\n")
 
-        return result
+        return "".join(parts)
 
     except Exception as e:
         return f"Error analyzing directory code '{directory}': {str(e)}"
@@ -335,7 +561,7 @@ def find_code_patterns(
         String with pattern matches
     """
     try:
-        full_path = resolve_project_path(file_path, project_root)
+        full_path, base_path = resolve_project_paths(file_path, project_root)
 
         if not full_path.exists():
             return f"Error: File '{full_path}' does not exist"
@@ -343,52 +569,188 @@ def find_code_patterns(
         with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
             content = f.read()
 
-        # Show relative path for cleaner output
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
-
         try:
             display_path = full_path.relative_to(base_path)
         except ValueError:
             display_path = full_path
 
-        result = f"Code Pattern Search in: {display_path}\n"
-        result += "=" * 50 + "\n\n"
+        parts = []
+        append = parts.append
+        append(f"Code Pattern Search in: {display_path}\n")
+        append("=" * 50 + "\n\n")
 
-        lines = content.split("\n")
+        line_starts = _line_starts(content)
         total_matches = 0
 
+        # Compile every pattern once up front, keeping invalid ones for reporting
+        compiled = []
         for pattern in patterns:
             try:
-                regex = re.compile(pattern, re.MULTILINE)
-                matches = []
-
-                for line_num, line in enumerate(lines, 1):
-                    if regex.search(line):
-                        matches.append(f"  Line {line_num}: {line.strip()}")
-
-                if matches:
-                    result += f"🔍 Pattern '{pattern}':\n"
-                    result += "\n".join(matches[:10])  # Show first 10 matches
-                    if len(matches) > 10:
-                        result += f"\n  ... and {len(matches) - 10} more matches"
-                    result += "\n\n"
-                    total_matches += len(matches)
-                else:
-                    result += f"❌ Pattern '{pattern}': No matches\n\n"
-
+                compiled.append((pattern, re.compile(pattern, re.MULTILINE), None))
             except re.error as e:
-                result += f"❌ Invalid pattern '{pattern}': {e}\n\n"
+                compiled.append((pattern, None, e))
+
+        # A pattern whose required literal text is absent from the file cannot
+        # match, so only the remaining patterns are actually scanned
+        searchable = {
+            i: pattern
+            for i, (pattern, regex, _) in enumerate(compiled)
+            if regex is not None and _may_match(regex, content)
+        }
+
+        # Scan for all searchable patterns in a single pass when Hyperscan is
+        # available; patterns that could span lines are left to the re module
+        lines_by_pattern = None
+        if hyperscan is not None:
+            lines_by_pattern = _hyperscan_match_lines(
+                content,
+                {
+                    i: pattern
+                    for i, pattern in searchable.items()
+                    if not spans_lines(compiled[i][1])
+                },
+            )
+
+        for index, (pattern, regex, error) in enumerate(compiled):
+            if regex is None:
+                append(f"❌ Invalid pattern '{pattern}': {error}\n\n")
+                continue
+
+            if index not in searchable:
+                line_indexes = []
+            elif lines_by_pattern is not None and not spans_lines(regex):
+                line_indexes = lines_by_pattern.get(index, [])
+            else:
+                line_indexes = _regex_match_lines(regex, content, line_starts)
+
+            matches = []
+            for line_index in line_indexes:
+                line = _line_at(content, line_starts, line_index)
+                matches.append(f"  Line {line_index + 1}: {line.strip()}")
+
+            if matches:
+                append(f"🔍 Pattern '{pattern}':\n")
+                append("\n".join(matches[:10]))  # Show first 10 matches
+                if len(matches) > 10:
+                    append(f"\n  ... and {len(matches) - 10} more matches")
+                append("\n\n")
+                total_matches += len(matches)
+            else:
+                append(f"❌ Pattern '{pattern}': No matches\n\n")
 
-        result += f"Total matches found: {total_matches}\n"
-        return result
+        append(f"Total matches found: {total_matches}\n")
+        return "".join(parts)
 
     except Exception as e:
         return f"Error searching for patterns in '{file_path}': {str(e)}"
 
 
+def _count_lines(content: Union[str, bytes]) -> int:
+    """Count lines without splitting; a trailing newline ends the last line."""
+    newline = b"\n" if isinstance(content, bytes) else "\n"
+    return content.count(newline) + (0 if content.endswith(newline) else 1)
+
+
+def _count_blank_lines(content: str) -> int:
+    """Count whitespace-only lines in a single regex pass."""
+    blank = len(_BLANK_LINE_RE.findall(content))
+    # "$" also matches after a final newline (or in empty content), where
+    # there is no actual line
+    if not content or content.endswith("\n"):
+        blank -= 1
+    return blank
+
+
+def _line_starts(content: str) -> List[int]:
+    """Return the character offset at which each line begins."""
+    return [0] + [match.end() for match in re.finditer("\n", content)]
+
+
+def _line_at(content: str, line_starts: List[int], line_index: int) -> str:
+    """Slice a single line out of content using its precomputed start offsets."""
+    start = line_starts[line_index]
+    if line_index + 1 < len(line_starts):
+        return content[start : line_starts[line_index + 1] - 1]
+    return content[start:]
+
+
+def _may_match(regex: re.Pattern, content: str) -> bool:
+    """Cheap prefilter: False only if regex provably cannot match content."""
+    if regex.flags & re.IGNORECASE:
+        return True
+    literal = required_literal(regex)
+    return literal is None or literal in content
+
+
+def _regex_match_lines(
+    regex: re.Pattern, content: str, line_starts: List[int]
+) -> List[int]:
+    """
+    Return the indexes of lines containing a match, scanning content once.
+
+    Patterns that could match across a newline (see spans_lines) are
+    searched line by line instead, so a match never swallows later lines.
+    """
+    if spans_lines(regex):
+        return [
+            line_index
+            for line_index, line in enumerate(content.split("\n"))
+            if regex.search(line)
+        ]
+
+    line_indexes = []
+    last_line = -1
+    for match in regex.finditer(content):
+        line_index = bisect_right(line_starts, match.start()) - 1
+        if line_index != last_line:
+            line_indexes.append(line_index)
+            last_line = line_index
+    return line_indexes
+
+
+def _hyperscan_match_lines(
+    content: str, patterns: Dict[int, str]
+) -> Optional[Dict[int, List[int]]]:
+    """
+    Match several patterns in one Hyperscan pass over content.
+
+    Returns a mapping of pattern id to matching line indexes, or None when
+    Hyperscan cannot compile the patterns (e.g. backreferences or lookarounds)
+    so the caller can fall back to the re module.
+    """
+    if not patterns:
+        return {}
+
+    try:
+        ids = list(patterns)
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[patterns[i].encode("utf-8") for i in ids],
+            ids=ids,
+            elements=len(ids),
+            flags=[
+                hyperscan.HS_FLAG_MULTILINE
+                | hyperscan.HS_FLAG_SOM_LEFTMOST
+                | hyperscan.HS_FLAG_UTF8
+            ]
+            * len(ids),
+        )
+    except Exception:
+        return None
+
+    # Hyperscan reports byte offsets, so build line starts over the encoded buffer
+    data = content.encode("utf-8")
+    byte_line_starts = [0] + [match.end() for match in re.finditer(b"\n", data)]
+
+    matched = defaultdict(set)
+
+    def on_match(pattern_id, start, end, flags, context):
+        matched[pattern_id].add(bisect_right(byte_line_starts, start) - 1)
+
+    database.scan(data, match_event_handler=on_match)
+    return {pattern_id: sorted(found) for pattern_id, found in matched.items()}
+
+
 def analyze_dependencies(file_path: str, project_root: str = None) -> str:
     """
     Analyze dependencies and imports in a code file.
@@ -401,7 +763,7 @@ def analyze_dependencies(file_path: str, project_root: str = None) -> str:
         String with dependency analysis
     """
     try:
-        full_path = resolve_project_path(file_path, project_root)
+        full_path, base_path = resolve_project_paths(file_path, project_root)
 
         if not full_path.exists():
             return f"Error: File '{full_path}' does not exist"
@@ -409,19 +771,15 @@ def analyze_dependencies(file_path: str, project_root: str = None) -> str:
         with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
             content = f.read()
 
-        # Show relative path for cleaner output
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
-
         try:
             display_path = full_path.relative_to(base_path)
         except ValueError:
             display_path = full_path
 
-        result = f"Dependency Analysis: {display_path}\n"
-        result += "=" * 50 + "\n\n"
+        parts = []
+        append = parts.append
+        append(f"Dependency Analysis: {display_path}\n")
+        append("=" * 50 + "\n\n")
 
         ext = full_path.suffix.lower()
 
@@ -437,59 +795,96 @@ def analyze_dependencies(file_path: str, project_root: str = None) -> str:
         if not deps["imports"]:
             return f"No dependencies found in {display_path}"
 
-        result += f"📦 Dependencies Summary:\n"
-        result += f"  Total imports: {len(deps['imports'])}\n"
-        result += f"  External packages: {len(deps['external'])}\n"
-        result += f"  Local imports: {len(deps['local'])}\n"
-        result += f"  Standard library: {len(deps['stdlib'])}\n\n"
+        append(f"📦 Dependencies Summary:\n")
+        append(f"  Total imports: {len(deps['imports'])}\n")
+        append(f"  External packages: {len(deps['external'])}\n")
+        append(f"  Local imports: {len(deps['local'])}\n")
+        append(f"  Standard library: {len(deps['stdlib'])}\n\n")
 
         if deps["external"]:
-            result += f"🌐 External Packages:\n"
+            append(f"🌐 External Packages:\n")
             for pkg in sorted(deps["external"]):
-                result += f"  - {pkg}\n"
-            result += "\n"
+                append(f"  - {pkg}\n")
+            append("\n")
 
         if deps["local"]:
-            result += f"🏠 Local Imports:\n"
+            append(f"🏠 Local Imports:\n")
             for imp in sorted(deps["local"]):
-                result += f"  - {imp}\n"
-            result += "\n"
+                append(f"  - {imp}\n")
+            append("\n")
 
         if deps["stdlib"]:
-            result += f"📚 Standard Library:\n"
+            append(f"📚 Standard Library:\n")
             for lib in sorted(deps["stdlib"]):
-                result += f"  - {lib}\n"
-            result += "\n"
+                append(f"  - {lib}\n")
+            append("\n")
 
-        return result
+        return "".join(parts)
 
     except Exception as e:
         return f"Error analyzing dependencies in '{file_path}': {str(e)}"
 
 
+# Node types that each add one branch to a function's cyclomatic complexity
+_COMPLEXITY_TYPES = frozenset(
+    {
+        ast.If,
+        ast.While,
+        ast.For,
+        ast.AsyncFor,
+        ast.ExceptHandler,
+        ast.With,
+        ast.AsyncWith,
+    }
+)
+
+
+def _walk_fast(node: ast.AST):
+    """Yield node and all its descendants (depth-first; cheaper than ast.walk)."""
+    stack = [node]
+    pop = stack.pop
+    extend = stack.extend
+    iter_child_nodes = ast.iter_child_nodes
+    while stack:
+        current = pop()
+        yield current
+        extend(iter_child_nodes(current))
+
+
 class PythonCodeAnalyzer:
-    """Helper class for analyzing Python AST."""
+    """
+    Helper class for analyzing Python AST.
+
+    Functions and classes are stored column-wise: parallel lists of names and
+    compact integer arrays for line numbers, argument counts, lengths and
+    method counts.
+    """
 
     def __init__(self):
-        self.functions = []
-        self.classes = []
+        self.func_names = []
+        self.func_lines = array("i")
+        self.func_args = array("i")
+        self.func_lengths = array("i")
+        self.class_names = []
+        self.class_lines = array("i")
+        self.class_methods = array("i")
         self.imports = []
         self.globals = []
         self.complexity = 0
 
-    def analyze(self, tree: ast.AST, content: str) -> Dict[str, Any]:
+    def analyze(self, tree: ast.AST) -> Dict[str, Any]:
         """Analyze Python AST and return structured information."""
         self.visit(tree)
 
-        lines = content.split("\n")
-        function_lengths = [func.get("length", 0) for func in self.functions]
+        function_lengths = self.func_lengths
+        max_length = max(function_lengths) if function_lengths else 0
 
         insights = []
-        if len(self.functions) > 20:
+        if len(self.func_names) > 20:
             insights.append(
                 "Large number of functions - consider splitting into modules"
             )
-        if any(length > 50 for length in function_lengths):
+        if max_length > 50:
             insights.append(
                 "Some functions are very long - consider breaking them down"
             )
@@ -499,79 +894,113 @@ class PythonCodeAnalyzer:
             insights.append("High cyclomatic complexity - consider refactoring")
 
         return {
-            "functions": self.functions,
-            "classes": self.classes,
+            "function_names": self.func_names,
+            "function_lines": self.func_lines,
+            "function_args": self.func_args,
+            "function_lengths": self.func_lengths,
+            "class_names": self.class_names,
+            "class_lines": self.class_lines,
+            "class_methods": self.class_methods,
             "imports": self.imports,
             "globals": self.globals,
             "avg_function_length": sum(function_lengths) / len(function_lengths)
             if function_lengths
             else 0,
-            "max_function_length": max(function_lengths) if function_lengths else 0,
+            "max_function_length": max_length,
             "cyclomatic_complexity": self.complexity,
             "insights": insights,
         }
 
-    def visit(self, node: ast.AST):
-        """Visit AST nodes recursively."""
-        if isinstance(node, ast.FunctionDef):
-            self.functions.append(
-                {
-                    "name": node.name,
-                    "line": node.lineno,
-                    "args": len(node.args.args),
-                    "length": getattr(node, "end_lineno", node.lineno) - node.lineno,
-                }
-            )
-            self.complexity += self._calculate_complexity(node)
-
-        elif isinstance(node, ast.ClassDef):
-            methods = [n for n in node.body if isinstance(n, ast.FunctionDef)]
-            self.classes.append(
-                {"name": node.name, "line": node.lineno, "methods": len(methods)}
-            )
-
-        elif isinstance(node, (ast.Import, ast.ImportFrom)):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    self.imports.append(alias.name)
-            else:
-                module = node.module or ""
-                for alias in node.names:
-                    self.imports.append(
-                        f"{module}.{alias.name}" if module else alias.name
-                    )
-
-        elif isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    self.globals.append(target.id)
-
-        # Continue visiting child nodes
-        for child in ast.iter_child_nodes(node):
-            self.visit(child)
-
-    def _calculate_complexity(self, node: ast.FunctionDef) -> int:
-        """Calculate cyclomatic complexity for a function."""
-        complexity = 1  # Base complexity
-
-        for child in ast.walk(node):
-            if isinstance(
-                child,
-                (
-                    ast.If,
-                    ast.While,
-                    ast.For,
-                    ast.AsyncFor,
-                    ast.ExceptHandler,
-                    ast.With,
-                    ast.AsyncWith,
-                ),
-            ):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
+    @staticmethod
+    def count_only(tree: ast.AST) -> Tuple[int, int]:
+        """Count function and class definitions without collecting any details."""
+        functions = 0
+        classes = 0
+        for node in _walk_fast(tree):
+            node_type = type(node)
+            if node_type is ast.FunctionDef:
+                functions += 1
+            elif node_type is ast.ClassDef:
+                classes += 1
+        return functions, classes
 
-        return complexity
+    def visit(self, node: ast.AST):
+        """
+        Visit node and its descendants in one iterative pre-order pass.
+
+        Cyclomatic complexity is accumulated in the same pass: each branch node
+        counts once for every function enclosing it, which gives the same total
+        as walking every function's subtree separately. Node handling is
+        dispatched on the exact node type, so the common no-match case costs a
+        single dict lookup.
+        """
+        stack = [(node, 0)]
+        pop = stack.pop
+        push = stack.append
+        iter_child_nodes = ast.iter_child_nodes
+        handlers = self._HANDLERS
+
+        while stack:
+            current, depth = pop()
+            node_type = type(current)
+
+            if depth:
+                if node_type in _COMPLEXITY_TYPES:
+                    self.complexity += depth
+                elif node_type is ast.BoolOp:
+                    self.complexity += depth * (len(current.values) - 1)
+
+            handler = handlers.get(node_type)
+            if handler is not None:
+                handler(self, current)
+                if node_type is ast.FunctionDef:
+                    depth += 1
+
+            # Push children reversed so they are visited in source order
+            children = list(iter_child_nodes(current))
+            for child in reversed(children):
+                push((child, depth))
+
+    def _handle_function(self, node: ast.FunctionDef):
+        """Record a function definition and its base complexity."""
+        self.func_names.append(node.name)
+        self.func_lines.append(node.lineno)
+        self.func_args.append(len(node.args.args))
+        self.func_lengths.append(getattr(node, "end_lineno", node.lineno) - node.lineno)
+        self.complexity += 1  # Base complexity
+
+    def _handle_class(self, node: ast.ClassDef):
+        """Record a class definition and its method count."""
+        methods = [n for n in node.body if isinstance(n, ast.FunctionDef)]
+        self.class_names.append(node.name)
+        self.class_lines.append(node.lineno)
+        self.class_methods.append(len(methods))
+
+    def _handle_import(self, node: ast.Import):
+        """Record the modules named in an import statement."""
+        for alias in node.names:
+            self.imports.append(alias.name)
+
+    def _handle_import_from(self, node: ast.ImportFrom):
+        """Record the names imported by a from-import statement."""
+        module = node.module or ""
+        for alias in node.names:
+            self.imports.append(f"{module}.{alias.name}" if module else alias.name)
+
+    def _handle_assign(self, node: ast.Assign):
+        """Record names bound by a plain assignment."""
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.globals.append(target.id)
+
+    # Exact node type -> handler, used by visit() for single-lookup dispatch
+    _HANDLERS = {
+        ast.FunctionDef: _handle_function,
+        ast.ClassDef: _handle_class,
+        ast.Import: _handle_import,
+        ast.ImportFrom: _handle_import_from,
+        ast.Assign: _handle_assign,
+    }
 
 
 def analyze_python_dependencies(content: str) -> Dict[str, List[str]]:
@@ -580,7 +1009,7 @@ def analyze_python_dependencies(content: str) -> Dict[str, List[str]]:
         tree = ast.parse(content)
         imports = []
 
-        for node in ast.walk(tree):
+        for node in _walk_fast(tree):
             if isinstance(node, ast.Import):
                 for alias in node.names:
                     imports.append(alias.name.split(".")[0])
@@ -588,52 +1017,18 @@ def analyze_python_dependencies(content: str) -> Dict[str, List[str]]:
                 if node.module:
                     imports.append(node.module.split(".")[0])
 
-        # Categorize imports
-        python_stdlib = {
-            "os",
-            "sys",
-            "json",
-            "urllib",
-            "http",
-            "datetime",
-            "time",
-            "re",
-            "collections",
-            "itertools",
-            "functools",
-            "pathlib",
-            "subprocess",
-            "threading",
-            "multiprocessing",
-            "asyncio",
-            "logging",
-            "unittest",
-            "sqlite3",
-            "csv",
-            "xml",
-            "html",
-            "email",
-            "base64",
-            "hashlib",
-        }
-
-        external = []
-        local = []
-        stdlib = []
-
-        for imp in set(imports):
-            if imp in python_stdlib:
-                stdlib.append(imp)
-            elif imp.startswith(".") or "/" in imp:
-                local.append(imp)
-            else:
-                external.append(imp)
+        # Categorize imports with set operations
+        unique_imports = set(imports)
+        stdlib = unique_imports & _PY_STDLIB
+        remaining = unique_imports - _PY_STDLIB
+        local = {imp for imp in remaining if imp.startswith(".") or "/" in imp}
+        external = remaining - local
 
         return {
             "imports": imports,
-            "external": external,
-            "local": local,
-            "stdlib": stdlib,
+            "external": list(external),
+            "local": list(local),
+            "stdlib": list(stdlib),
         }
 
     except Exception:
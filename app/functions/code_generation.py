@@ -4,77 +4,274 @@ All functions return strings as they will be passed to the AI agent.
 """
 
 import os
-import re
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Sequence, Tuple, Union
 from datetime import datetime
+from functools import lru_cache
+from string import Template
+
+from app.functions.fileio import write_text
+from app.functions.paths import (
+    relative_display_path,
+    resolve_project_path,
+    resolve_project_paths,
+)
 
 
-def resolve_project_path(input_path: str, project_root: str = None) -> Path:
-    """
-    Resolve a path relative to the project root, handling various input formats.
+_PY_MAIN_TMPL = Template(
+    '''"""
+Main module for $project_name.
+"""
 
-    Args:
-        input_path: Input path that can be:
-                   - Absolute system path (/Users/name/project/file.py)
-                   - Relative to project root (/src/main.py -> project_root/src/main.py)
-                   - Relative path (src/main.py -> project_root/src/main.py)
-                   - Current directory (. or empty)
-        project_root: Project root directory (uses current dir if None)
 
-    Returns:
-        Path object with resolved path
-    """
-    # First resolve the project_root itself using the same logic
-    if project_root:
-        project_root = project_root.strip()
+def main():
+    """Main function."""
+    print("Hello from $project_name!")
 
-        # Handle empty or current directory for project_root
-        if not project_root or project_root == "." or project_root == "./":
-            base_path = Path.cwd().resolve()
-        else:
-            root_path_obj = Path(project_root)
-
-            # Apply same logic to project_root
-            if root_path_obj.is_absolute():
-                # Check if it's a real absolute system path
-                if len(root_path_obj.parts) > 2 and (
-                    root_path_obj.exists()
-                    or str(root_path_obj).startswith(("/", "C:", "D:"))
-                ):
-                    base_path = root_path_obj.resolve()
-                else:
-                    # Treat as relative to current directory (remove leading slash)
-                    relative_part = str(root_path_obj).lstrip("/")
-                    base_path = (Path.cwd() / relative_part).resolve()
-            else:
-                # Regular relative path
-                base_path = (Path.cwd() / project_root).resolve()
-    else:
-        base_path = Path.cwd().resolve()
-
-    input_path = input_path.strip()
-
-    # Handle empty or current directory for input_path
-    if not input_path or input_path == "." or input_path == "./":
-        return base_path
-
-    path_obj = Path(input_path)
-
-    # Check if it's a real absolute system path (has multiple parts and exists or looks like system path)
-    if path_obj.is_absolute():
-        # If it starts with system root and has multiple parts, treat as absolute
-        if len(path_obj.parts) > 2 and (
-            path_obj.exists() or str(path_obj).startswith(("/", "C:", "D:"))
-        ):
-            return path_obj.resolve()
-        else:
-            # Treat as relative to project root (remove leading slash)
-            relative_part = str(path_obj).lstrip("/")
-            return (base_path / relative_part).resolve()
-    else:
-        # Regular relative path
-        return (base_path / input_path).resolve()
+
+if __name__ == "__main__":
+    main()
+'''
+)
+
+_SETUP_PY_TMPL = Template(
+    """from setuptools import setup, find_packages
+
+setup(
+    name="$project_name",
+    version="0.1.0",
+    description="A Python project",
+    packages=find_packages(),
+    python_requires=">=3.7",
+    install_requires=[
+        # Add dependencies here
+    ],
+    entry_points={
+        "console_scripts": [
+            "$project_name=$project_name.main:main",
+        ],
+    },
+)
+"""
+)
+
+_PACKAGE_JSON_TMPL = Template(
+    """{
+  "name": "$project_name",
+  "version": "1.0.0",
+  "description": "",
+  "main": "src/index.js",
+  "scripts": {
+    "start": "node src/index.js",
+    "test": "echo \\"Error: no test specified\\" && exit 1"
+  },
+  "keywords": [],
+  "author": "",
+  "license": "ISC"
+}
+"""
+)
+
+_JS_MAIN_TMPL = Template(
+    """/**
+ * Main module for $project_name
+ */
+
+console.log('Hello from $project_name!');
+"""
+)
+
+_README_TMPL = Template(
+    """# $project_name
+
+## Description
+
+A new $project_type project.
+
+## Installation
+
+```bash
+# Add installation instructions here
+```
+
+## Usage
+
+```bash
+# Add usage instructions here
+```
+
+## License
+
+MIT License
+"""
+)
+
+_PY_GITIGNORE_BYTES = b"""# Python
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+build/
+develop-eggs/
+dist/
+downloads/
+eggs/
+.eggs/
+lib/
+lib64/
+parts/
+sdist/
+var/
+wheels/
+*.egg-info/
+.installed.cfg
+*.egg
+
+# Virtual environments
+venv/
+env/
+ENV/
+
+# IDE
+.vscode/
+.idea/
+*.swp
+*.swo
+
+# OS
+.DS_Store
+Thumbs.db
+"""
+
+_JS_GITIGNORE_BYTES = b"""# Dependencies
+node_modules/
+npm-debug.log*
+yarn-debug.log*
+yarn-error.log*
+
+# Production
+build/
+dist/
+
+# Environment
+.env
+.env.local
+.env.development.local
+.env.test.local
+.env.production.local
+
+# IDE
+.vscode/
+.idea/
+
+# OS
+.DS_Store
+Thumbs.db
+"""
+
+# Scaffold kind for each supported project_type (lowercased)
+_PROJECT_KINDS = {"python": "py", "javascript": "js", "js": "js", "node": "js"}
+
+# .gitignore body per scaffold kind; anything else gets the JavaScript one
+_GITIGNORES = {"py": _PY_GITIGNORE_BYTES, "js": _JS_GITIGNORE_BYTES}
+
+
+_UNITTEST_HEADER = '''"""
+Unit tests for {module}.
+"""
+
+import unittest
+from {import_path} import {imports}
+
+
+'''
+
+_UNITTEST_CLASS_TMPL = '''class Test{cls}(unittest.TestCase):
+    """Test cases for {cls} class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.instance = {cls}()
+
+    def test_init(self):
+        """Test {cls} initialization."""
+        self.assertIsInstance(self.instance, {cls})
+
+    # TODO: Add more specific tests for {cls}
+
+
+'''
+
+_UNITTEST_FUNCTIONS_HEADER = '''class TestFunctions(unittest.TestCase):
+    """Test cases for module functions."""
+
+'''
+
+_UNITTEST_FUNCTION_TMPL = '''    def test_{func}(self):
+        """Test {func} function."""
+        # TODO: Implement test for {func}
+        pass
+
+'''
+
+_UNITTEST_FOOTER = """
+
+if __name__ == '__main__':
+    unittest.main()
+"""
+
+_PYTEST_HEADER = '''"""
+Pytest tests for {module}.
+"""
+
+import pytest
+from {import_path} import {imports}
+
+
+'''
+
+_PYTEST_FIXTURE_TMPL = '''@pytest.fixture
+def {instance}():
+    """Fixture for {cls} instance."""
+    return {cls}()
+
+
+'''
+
+_PYTEST_CLASS_TMPL = '''class Test{cls}:
+    """Test cases for {cls} class."""
+
+    def test_init(self, {instance}):
+        """Test {cls} initialization."""
+        assert isinstance({instance}, {cls})
+
+    # TODO: Add more specific tests for {cls}
+
+
+'''
+
+_PYTEST_FUNCTION_TMPL = '''def test_{func}():
+    """Test {func} function."""
+    # TODO: Implement test for {func}
+    pass
+
+
+'''
+
+
+def _resolve_base(project_root: Optional[str]) -> str:
+    """Return the resolved project root that display paths are made relative to."""
+    return str(resolve_project_paths("", project_root).base_path)
+
+
+def _import_path(source_path: Path, project_root: Optional[str]) -> str:
+    """Return the dotted module path of source_path within project_root."""
+    if project_root:
+        rel_path = relative_display_path(source_path, _resolve_base(project_root))
+        if not os.path.isabs(rel_path):
+            return os.path.splitext(rel_path)[0].replace(os.sep, ".")
+    return source_path.stem
 
 
 def generate_python_class(
@@ -105,57 +302,51 @@ def generate_python_class(
         # Create parent directories if they don't exist
         full_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Generate class code
-        code = f'"""\n{class_name} module.\n"""\n\n'
-
         # Add imports if needed
+        import_line = ""
         if parent_class and "." in parent_class:
             module, cls = parent_class.rsplit(".", 1)
-            code += f"from {module} import {cls}\n\n"
+            import_line = f"from {module} import {cls}\n\n"
             parent_class = cls
 
+        # Build the class code and write it in one go
+        parts = []
+        append = parts.append
+        append(f'"""\n{class_name} module.\n"""\n\n')
+        append(import_line)
+
         # Class definition
         inheritance = f"({parent_class})" if parent_class else ""
-        code += f"class {class_name}{inheritance}:\n"
+        append(f"class {class_name}{inheritance}:\n")
 
         # Add docstring
         if docstring:
-            code += f'    """{docstring}"""\n\n'
+            append(f'    """{docstring}"""\n\n')
         else:
-            code += f'    """{class_name} class."""\n\n'
+            append(f'    """{class_name} class."""\n\n')
 
         # Constructor
-        code += "    def __init__(self):\n"
+        append("    def __init__(self):\n")
         if parent_class:
-            code += "        super().__init__()\n"
-        code += "        pass\n\n"
+            append("        super().__init__()\n")
+        append("        pass\n\n")
 
         # Add methods
         if methods:
             for method in methods:
-                code += f"    def {method}(self):\n"
-                code += f'        """TODO: Implement {method} method."""\n'
-                code += "        pass\n\n"
+                append(f"    def {method}(self):\n")
+                append(f'        """TODO: Implement {method} method."""\n')
+                append("        pass\n\n")
         else:
             # Add a default method
-            code += "    def example_method(self):\n"
-            code += '        """Example method."""\n'
-            code += "        pass\n"
+            append("    def example_method(self):\n")
+            append('        """Example method."""\n')
+            append("        pass\n")
 
-        # Write to file
-        with open(full_path, "w", encoding="utf-8") as f:
-            f.write(code)
+        write_text(str(full_path), "".join(parts))
 
         # Show relative path for cleaner output
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
-
-        try:
-            display_path = full_path.relative_to(base_path)
-        except ValueError:
-            display_path = full_path
+        display_path = relative_display_path(full_path, _resolve_base(project_root))
 
         return f"✅ Successfully generated Python class '{class_name}' in {display_path}"
 
@@ -193,49 +384,38 @@ def generate_python_function(
         # Create parent directories if they don't exist
         full_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Check if file exists and read current content
-        existing_content = ""
-        if full_path.exists():
-            with open(full_path, "r", encoding="utf-8") as f:
-                existing_content = f.read()
-
         # Generate function code
         func_keyword = "async def" if async_func else "def"
         params = ", ".join(parameters) if parameters else ""
         return_annotation = f" -> {return_type}" if return_type else ""
 
-        code = f"{func_keyword} {function_name}({params}){return_annotation}:\n"
+        parts = [f"{func_keyword} {function_name}({params}){return_annotation}:\n"]
 
         # Add docstring
         if docstring:
-            code += f'    """{docstring}"""\n'
+            parts.append(f'    """{docstring}"""\n')
         else:
-            code += f'    """{function_name} function."""\n'
+            parts.append(f'    """{function_name} function."""\n')
 
-        code += "    pass\n\n"
+        parts.append("    pass\n\n")
 
-        # Append to existing content or create new
-        if existing_content:
-            final_content = existing_content + "\n" + code
-        else:
-            final_content = f'"""\n{file_path.stem} module.\n"""\n\n' + code
+        code = "".join(parts)
 
-        # Write to file
-        with open(full_path, "w", encoding="utf-8") as f:
-            f.write(final_content)
+        # Append to an existing module, or start a new one with a docstring
+        try:
+            appending = full_path.stat().st_size > 0
+        except FileNotFoundError:
+            appending = False
 
-        # Show relative path for cleaner output
-        if project_root:
-            base_path = Path(project_root).resolve()
+        if appending:
+            write_text(str(full_path), "\n" + code, append=True)
         else:
-            base_path = Path.cwd().resolve()
+            write_text(str(full_path), f'"""\n{full_path.stem} module.\n"""\n\n' + code)
 
-        try:
-            display_path = full_path.relative_to(base_path)
-        except ValueError:
-            display_path = full_path
+        # Show relative path for cleaner output
+        display_path = relative_display_path(full_path, _resolve_base(project_root))
 
-        action = "appended to" if existing_content else "created in"
+        action = "appended to" if appending else "created in"
         return f"✅ Successfully {action} function '{function_name}' in {display_path}"
 
     except Exception as e:
@@ -266,227 +446,134 @@ def generate_project_structure(
         base_path = resolve_project_path(project_root or ".", None)
         project_path = base_path / project_name
 
-        # Create project directory
-        project_path.mkdir(parents=True, exist_ok=True)
-
-        created_files = []
-
-        if project_type.lower() == "python":
-            # Python project structure
-            dirs = [
-                f"{project_name}",
-                "tests" if include_tests else None,
-                "docs" if include_docs else None,
-                "scripts",
-                "data",
-            ]
-
-            for dir_name in filter(None, dirs):
-                dir_path = project_path / dir_name
-                dir_path.mkdir(exist_ok=True)
-
-                # Add __init__.py for Python packages
-                if dir_name in [project_name, "tests"]:
-                    init_file = dir_path / "__init__.py"
-                    init_file.write_text(f'"""{dir_name} package."""\n')
-                    created_files.append(str(init_file.relative_to(base_path)))
-
-            # Create main module
-            main_file = project_path / f"{project_name}" / "main.py"
-            main_content = f'''"""
-Main module for {project_name}.
-"""
-
-
-def main():
-    """Main function."""
-    print("Hello from {project_name}!")
-
-
-if __name__ == "__main__":
-    main()
-'''
-            main_file.write_text(main_content)
-            created_files.append(str(main_file.relative_to(base_path)))
-
-            # Create requirements.txt
-            req_file = project_path / "requirements.txt"
-            req_file.write_text("# Add your dependencies here\n")
-            created_files.append(str(req_file.relative_to(base_path)))
-
-            # Create setup.py
-            setup_file = project_path / "setup.py"
-            setup_content = f"""from setuptools import setup, find_packages
-
-setup(
-    name="{project_name}",
-    version="0.1.0",
-    description="A Python project",
-    packages=find_packages(),
-    python_requires=">=3.7",
-    install_requires=[
-        # Add dependencies here
-    ],
-    entry_points={{
-        "console_scripts": [
-            "{project_name}={project_name}.main:main",
-        ],
-    }},
-)
-"""
-            setup_file.write_text(setup_content)
-            created_files.append(str(setup_file.relative_to(base_path)))
-
-        elif project_type.lower() in ["javascript", "js", "node"]:
-            # JavaScript/Node.js project structure
-            dirs = [
-                "src",
-                "tests" if include_tests else None,
-                "docs" if include_docs else None,
-            ]
-
-            for dir_name in filter(None, dirs):
-                (project_path / dir_name).mkdir(exist_ok=True)
-
-            # Create package.json
-            package_file = project_path / "package.json"
-            package_content = f"""{{
-  "name": "{project_name}",
-  "version": "1.0.0",
-  "description": "",
-  "main": "src/index.js",
-  "scripts": {{
-    "start": "node src/index.js",
-    "test": "echo \\"Error: no test specified\\" && exit 1"
-  }},
-  "keywords": [],
-  "author": "",
-  "license": "ISC"
-}}
-"""
-            package_file.write_text(package_content)
-            created_files.append(str(package_file.relative_to(base_path)))
-
-            # Create main file
-            main_file = project_path / "src" / "index.js"
-            main_content = f"""/**
- * Main module for {project_name}
- */
+        # Collect directories and (path, content) pairs, then create each
+        # directory once and write every file in a single pass
+        directories = {project_path}
+        files: List[Tuple[Path, Union[str, bytes]]] = []
 
-console.log('Hello from {project_name}!');
-"""
-            main_file.write_text(main_content)
-            created_files.append(str(main_file.relative_to(base_path)))
+        kind = _PROJECT_KINDS.get(project_type.lower())
+        if kind == "py":
+            scaffold_dirs, files = _scaffold_python(
+                project_path, project_name, include_tests, include_docs
+            )
+            directories.update(scaffold_dirs)
+        elif kind == "js":
+            scaffold_dirs, files = _scaffold_js(
+                project_path, project_name, include_tests, include_docs
+            )
+            directories.update(scaffold_dirs)
 
         # Create common files
         # README.md
-        readme_file = project_path / "README.md"
-        readme_content = f"""# {project_name}
-
-## Description
-
-A new {project_type} project.
-
-## Installation
-
-```bash
-# Add installation instructions here
-```
-
-## Usage
-
-```bash
-# Add usage instructions here
-```
-
-## License
-
-MIT License
-"""
-        readme_file.write_text(readme_content)
-        created_files.append(str(readme_file.relative_to(base_path)))
+        files.append(
+            (
+                project_path / "README.md",
+                _README_TMPL.substitute(
+                    project_name=project_name, project_type=project_type
+                ),
+            )
+        )
 
         # .gitignore
-        gitignore_file = project_path / ".gitignore"
-        if project_type.lower() == "python":
-            gitignore_content = """# Python
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-build/
-develop-eggs/
-dist/
-downloads/
-eggs/
-.eggs/
-lib/
-lib64/
-parts/
-sdist/
-var/
-wheels/
-*.egg-info/
-.installed.cfg
-*.egg
-
-# Virtual environments
-venv/
-env/
-ENV/
-
-# IDE
-.vscode/
-.idea/
-*.swp
-*.swo
-
-# OS
-.DS_Store
-Thumbs.db
-"""
-        else:
-            gitignore_content = """# Dependencies
-node_modules/
-npm-debug.log*
-yarn-debug.log*
-yarn-error.log*
-
-# Production
-build/
-dist/
-
-# Environment
-.env
-.env.local
-.env.development.local
-.env.test.local
-.env.production.local
-
-# IDE
-.vscode/
-.idea/
+        files.append(
+            (
+                project_path / ".gitignore",
+                _GITIGNORES.get(kind, _JS_GITIGNORE_BYTES),
+            )
+        )
 
-# OS
-.DS_Store
-Thumbs.db
-"""
-        gitignore_file.write_text(gitignore_content)
-        created_files.append(str(gitignore_file.relative_to(base_path)))
+        directories.update(path.parent for path, _ in files)
+        for directory in directories:
+            os.makedirs(directory, exist_ok=True)
 
-        result = f"✅ Successfully created {project_type} project '{project_name}'\n\n"
-        result += f"📁 Project directory: {project_path.relative_to(base_path)}\n\n"
-        result += f"📄 Created files:\n"
+        base_str = str(base_path)
+        created_files = []
+        for path, content in files:
+            write_text(str(path), content)
+            created_files.append(relative_display_path(path, base_str))
+
+        parts = [f"✅ Successfully created {project_type} project '{project_name}'\n\n"]
+        project_display = relative_display_path(project_path, base_str)
+        parts.append(f"📁 Project directory: {project_display}\n\n")
+        parts.append(f"📄 Created files:\n")
         for file_path in created_files:
-            result += f"  - {file_path}\n"
+            parts.append(f"  - {file_path}\n")
 
-        return result
+        return "".join(parts)
 
     except Exception as e:
         return f"❌ Error generating project structure: {str(e)}"
 
 
+def _scaffold_python(
+    project_path: Path, project_name: str, include_tests: bool, include_docs: bool
+) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+    """Return the directories and (path, content) files of a Python project."""
+    directories = []
+    files = []
+
+    dirs = [
+        f"{project_name}",
+        "tests" if include_tests else None,
+        "docs" if include_docs else None,
+        "scripts",
+        "data",
+    ]
+
+    for dir_name in filter(None, dirs):
+        dir_path = project_path / dir_name
+        directories.append(dir_path)
+
+        # Add __init__.py for Python packages
+        if dir_name in [project_name, "tests"]:
+            files.append((dir_path / "__init__.py", f'"""{dir_name} package."""\n'))
+
+    # Create main module
+    files.append(
+        (
+            project_path / f"{project_name}" / "main.py",
+            _PY_MAIN_TMPL.substitute(project_name=project_name),
+        )
+    )
+
+    # Create requirements.txt
+    files.append((project_path / "requirements.txt", "# Add your dependencies here\n"))
+
+    # Create setup.py
+    files.append(
+        (project_path / "setup.py", _SETUP_PY_TMPL.substitute(project_name=project_name))
+    )
+
+    return directories, files
+
+
+def _scaffold_js(
+    project_path: Path, project_name: str, include_tests: bool, include_docs: bool
+) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+    """Return the directories and (path, content) files of a Node.js project."""
+    dirs = [
+        "src",
+        "tests" if include_tests else None,
+        "docs" if include_docs else None,
+    ]
+    directories = [project_path / dir_name for dir_name in filter(None, dirs)]
+
+    files = [
+        # Create package.json
+        (
+            project_path / "package.json",
+            _PACKAGE_JSON_TMPL.substitute(project_name=project_name),
+        ),
+        # Create main file
+        (
+            project_path / "src" / "index.js",
+            _JS_MAIN_TMPL.substitute(project_name=project_name),
+        ),
+    ]
+
+    return directories, files
+
+
 def generate_test_file(
     source_file: str,
     test_file: str = None,
@@ -538,28 +625,19 @@ def generate_test_file(
             return f"❌ Unsupported test framework: {test_framework}"
 
         # Write test file
-        with open(test_path, "w", encoding="utf-8") as f:
-            f.write(test_code)
+        write_text(str(test_path), test_code)
 
         # Show relative paths for cleaner output
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
+        base_str = _resolve_base(project_root)
+        display_source = relative_display_path(source_path, base_str)
+        display_test = relative_display_path(test_path, base_str)
 
-        try:
-            display_source = source_path.relative_to(base_path)
-            display_test = test_path.relative_to(base_path)
-        except ValueError:
-            display_source = source_path
-            display_test = test_path
-
-        result = f"✅ Successfully generated {test_framework} test file\n"
-        result += f"📄 Source: {display_source}\n"
-        result += f"🧪 Test: {display_test}\n"
-        result += f"📋 Generated {len(functions)} function tests and {len(classes)} class tests"
+        parts = [f"✅ Successfully generated {test_framework} test file\n"]
+        parts.append(f"📄 Source: {display_source}\n")
+        parts.append(f"🧪 Test: {display_test}\n")
+        parts.append(f"📋 Generated {len(functions)} function tests and {len(classes)} class tests")
 
-        return result
+        return "".join(parts)
 
     except Exception as e:
         return f"❌ Error generating test file: {str(e)}"
@@ -613,21 +691,12 @@ def generate_documentation(
             return f"❌ Unsupported documentation format: {doc_format}"
 
         # Write documentation file
-        with open(doc_path, "w", encoding="utf-8") as f:
-            f.write(doc_content)
+        write_text(str(doc_path), doc_content)
 
         # Show relative paths for cleaner output
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
-
-        try:
-            display_source = source_path.relative_to(base_path)
-            display_doc = doc_path.relative_to(base_path)
-        except ValueError:
-            display_source = source_path
-            display_doc = doc_path
+        base_str = _resolve_base(project_root)
+        display_source = relative_display_path(source_path, base_str)
+        display_doc = relative_display_path(doc_path, base_str)
 
         return f"✅ Successfully generated {doc_format} documentation\n📄 Source: {display_source}\n📚 Docs: {display_doc}"
 
@@ -635,21 +704,39 @@ def generate_documentation(
         return f"❌ Error generating documentation: {str(e)}"
 
 
-def extract_testable_items(file_path: Path) -> tuple[List[str], List[str]]:
+def extract_testable_items(
+    file_path: Path,
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
     """Extract functions and classes from a Python file."""
+    try:
+        st = file_path.stat()
+    except OSError:
+        return (), ()
+
+    # Keyed on mtime and size so an edited file is parsed again
+    return _extract_testable_items(str(file_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=256)
+def _extract_testable_items(
+    path_str: str, mtime_ns: int, size: int
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Parse path_str and return its public top-level functions and classes."""
     functions = []
     classes = []
 
     try:
         import ast
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        tree = ast.parse(
+            Path(path_str).read_bytes(), filename=path_str, type_comments=False
+        )
 
-        tree = ast.parse(content)
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
+        # Only module-level definitions can be imported by the generated tests
+        for node in tree.body:
+            if isinstance(
+                node, (ast.FunctionDef, ast.AsyncFunctionDef)
+            ) and not node.name.startswith("_"):
                 functions.append(node.name)
             elif isinstance(node, ast.ClassDef):
                 classes.append(node.name)
@@ -657,154 +744,92 @@ def extract_testable_items(file_path: Path) -> tuple[List[str], List[str]]:
     except Exception:
         pass
 
-    return functions, classes
+    return tuple(functions), tuple(classes)
 
 
 def generate_unittest_template(
     source_path: Path,
-    functions: List[str],
-    classes: List[str],
+    functions: Sequence[str],
+    classes: Sequence[str],
     project_root: str = None,
 ) -> str:
     """Generate unittest template."""
     module_name = source_path.stem
 
     # Calculate relative import path
-    if project_root:
-        base_path = Path(project_root).resolve()
-        try:
-            rel_path = source_path.relative_to(base_path)
-            import_path = ".".join(rel_path.with_suffix("").parts)
-        except ValueError:
-            import_path = module_name
-    else:
-        import_path = module_name
-
-    code = f'''"""
-Unit tests for {module_name}.
-"""
-
-import unittest
-from {import_path} import {', '.join(functions + classes) if functions + classes else '*'}
+    import_path = _import_path(source_path, project_root)
 
-
-'''
+    imports = ", ".join(functions + classes) or "*"
+    parts = [
+        _UNITTEST_HEADER.format(
+            module=module_name, import_path=import_path, imports=imports
+        )
+    ]
 
     # Generate test classes for each class
     for class_name in classes:
-        code += f'''class Test{class_name}(unittest.TestCase):
-    """Test cases for {class_name} class."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.instance = {class_name}()
-
-    def test_init(self):
-        """Test {class_name} initialization."""
-        self.assertIsInstance(self.instance, {class_name})
-
-    # TODO: Add more specific tests for {class_name}
-
-
-'''
+        parts.append(_UNITTEST_CLASS_TMPL.format(cls=class_name))
 
     # Generate test class for functions
     if functions:
-        code += '''class TestFunctions(unittest.TestCase):
-    """Test cases for module functions."""
-
-'''
+        parts.append(_UNITTEST_FUNCTIONS_HEADER)
         for func_name in functions:
-            code += f'''    def test_{func_name}(self):
-        """Test {func_name} function."""
-        # TODO: Implement test for {func_name}
-        pass
+            parts.append(_UNITTEST_FUNCTION_TMPL.format(func=func_name))
 
-'''
+    parts.append(_UNITTEST_FOOTER)
 
-    code += """
-
-if __name__ == '__main__':
-    unittest.main()
-"""
-
-    return code
+    return "".join(parts)
 
 
 def generate_pytest_template(
     source_path: Path,
-    functions: List[str],
-    classes: List[str],
+    functions: Sequence[str],
+    classes: Sequence[str],
     project_root: str = None,
 ) -> str:
     """Generate pytest template."""
     module_name = source_path.stem
 
     # Calculate relative import path
-    if project_root:
-        base_path = Path(project_root).resolve()
-        try:
-            rel_path = source_path.relative_to(base_path)
-            import_path = ".".join(rel_path.with_suffix("").parts)
-        except ValueError:
-            import_path = module_name
-    else:
-        import_path = module_name
-
-    code = f'''"""
-Pytest tests for {module_name}.
-"""
-
-import pytest
-from {import_path} import {', '.join(functions + classes) if functions + classes else '*'}
-
+    import_path = _import_path(source_path, project_root)
 
-'''
+    imports = ", ".join(functions + classes) or "*"
+    parts = [
+        _PYTEST_HEADER.format(
+            module=module_name, import_path=import_path, imports=imports
+        )
+    ]
 
     # Generate fixtures for classes
     for class_name in classes:
-        code += f'''@pytest.fixture
-def {class_name.lower()}_instance():
-    """Fixture for {class_name} instance."""
-    return {class_name}()
-
-
-'''
+        parts.append(
+            _PYTEST_FIXTURE_TMPL.format(
+                cls=class_name, instance=f"{class_name.lower()}_instance"
+            )
+        )
 
     # Generate tests for classes
     for class_name in classes:
-        code += f'''class Test{class_name}:
-    """Test cases for {class_name} class."""
-
-    def test_init(self, {class_name.lower()}_instance):
-        """Test {class_name} initialization."""
-        assert isinstance({class_name.lower()}_instance, {class_name})
-
-    # TODO: Add more specific tests for {class_name}
-
-
-'''
+        parts.append(
+            _PYTEST_CLASS_TMPL.format(
+                cls=class_name, instance=f"{class_name.lower()}_instance"
+            )
+        )
 
     # Generate tests for functions
     for func_name in functions:
-        code += f'''def test_{func_name}():
-    """Test {func_name} function."""
-    # TODO: Implement test for {func_name}
-    pass
-
+        parts.append(_PYTEST_FUNCTION_TMPL.format(func=func_name))
 
-'''
-
-    return code
+    return "".join(parts)
 
 
 def generate_markdown_docs(
-    source_path: Path, functions: List[str], classes: List[str]
+    source_path: Path, functions: Sequence[str], classes: Sequence[str]
 ) -> str:
     """Generate Markdown documentation."""
     module_name = source_path.stem
 
-    doc = f"""# {module_name}
+    parts = [f"""# {module_name}
 
 ## Overview
 
@@ -812,10 +837,10 @@ Documentation for the `{module_name}` module.
 
 ## Classes
 
-"""
+"""]
 
     for class_name in classes:
-        doc += f"""### {class_name}
+        parts.append(f"""### {class_name}
 
 TODO: Add description for {class_name}
 
@@ -824,14 +849,14 @@ TODO: Add description for {class_name}
 - `__init__()`: Constructor
 - TODO: Add other methods
 
-"""
+""")
 
     if functions:
-        doc += """## Functions
+        parts.append("""## Functions
 
-"""
+""")
         for func_name in functions:
-            doc += f"""### {func_name}()
+            parts.append(f"""### {func_name}()
 
 TODO: Add description for {func_name}
 
@@ -841,27 +866,27 @@ TODO: Add description for {func_name}
 **Returns:**
 - TODO: Add return description
 
-"""
+""")
 
-    doc += f"""## Usage
+    parts.append(f"""## Usage
 
 ```python
 import {module_name}
 
 # TODO: Add usage examples
 ```
-"""
+""")
 
-    return doc
+    return "".join(parts)
 
 
 def generate_rst_docs(
-    source_path: Path, functions: List[str], classes: List[str]
+    source_path: Path, functions: Sequence[str], classes: Sequence[str]
 ) -> str:
     """Generate reStructuredText documentation."""
     module_name = source_path.stem
 
-    doc = f"""{module_name}
+    parts = [f"""{module_name}
 {'=' * len(module_name)}
 
 Overview
@@ -872,10 +897,10 @@ Documentation for the ``{module_name}`` module.
 Classes
 -------
 
-"""
+"""]
 
     for class_name in classes:
-        doc += f"""{class_name}
+        parts.append(f"""{class_name}
 {'^' * len(class_name)}
 
 TODO: Add description for {class_name}
@@ -886,15 +911,15 @@ Methods
 - ``__init__()``: Constructor
 - TODO: Add other methods
 
-"""
+""")
 
     if functions:
-        doc += """Functions
+        parts.append("""Functions
 ---------
 
-"""
+""")
         for func_name in functions:
-            doc += f"""{func_name}()
+            parts.append(f"""{func_name}()
 {'^' * (len(func_name) + 2)}
 
 TODO: Add description for {func_name}
@@ -907,9 +932,9 @@ TODO: Add description for {func_name}
 
 - TODO: Add return description
 
-"""
+""")
 
-    doc += f"""Usage
+    parts.append(f"""Usage
 -----
 
 .. code-block:: python
@@ -917,6 +942,6 @@ TODO: Add description for {func_name}
    import {module_name}
 
    # TODO: Add usage examples
-"""
+""")
 
-    return doc
+    return "".join(parts)
@@ -3,12 +3,33 @@ Database operations functions for maintenance and cleanup.
 """
 
 import os
+import time
+from functools import lru_cache
 from pathlib import Path
+from typing import Tuple
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.database import get_engine, get_db
 
+# How long a sqlite_master table-name snapshot may be reused, in seconds
+_TABLE_LIST_TTL = 5
+
+
+def _list_tables(engine) -> Tuple[str, ...]:
+    """Return the database's table names, reusing a recent snapshot."""
+    return _list_tables_snapshot(engine, int(time.monotonic() // _TABLE_LIST_TTL))
+
+
+@lru_cache(maxsize=1)
+def _list_tables_snapshot(engine, bucket: int) -> Tuple[str, ...]:
+    """Query sqlite_master for table names; cached per engine and TTL bucket."""
+    with engine.connect() as conn:
+        result = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type='table';")
+        )
+        return tuple(row[0] for row in result)
+
 
 def clean_database() -> str:
     """
@@ -20,27 +41,48 @@ def clean_database() -> str:
     try:
         engine = get_engine()
 
-        # Get all table names
-        with engine.connect() as conn:
-            result = conn.execute(
-                text("SELECT name FROM sqlite_master WHERE type='table';")
-            )
-            tables = [row[0] for row in result.fetchall()]
-
-        if not tables:
-            return "✅ Database is already clean (no tables found)"
+        from app.core.database import create_tables
 
-        # Drop all tables
         with engine.connect() as conn:
-            for table in tables:
-                if table != "sqlite_sequence":  # Don't drop SQLite internal table
-                    conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
-            conn.commit()
+            cursor = conn.connection.cursor()
+
+            # The schema is rebuilt from scratch, so skip journaling and
+            # fsyncs for the drop/create statements and restore them after
+            journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = cursor.execute("PRAGMA synchronous").fetchone()[0]
+            cursor.execute("PRAGMA journal_mode=MEMORY")
+            cursor.execute("PRAGMA synchronous=OFF")
+            try:
+                # List all tables and drop them with one script, so the
+                # drops run as a single batch in one transaction
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+                tables = [row[0] for row in cursor.fetchall()]
+
+                if not tables:
+                    return "✅ Database is already clean (no tables found)"
+
+                quote = engine.dialect.identifier_preparer.quote_identifier
+                drops = "".join(
+                    f"DROP TABLE IF EXISTS {quote(table)};\n"
+                    for table in tables
+                    if table != "sqlite_sequence"  # Don't drop SQLite internal table
+                )
+                cursor.executescript(
+                    f"PRAGMA foreign_keys=OFF;\nBEGIN;\n{drops}COMMIT;"
+                )
 
-        # Recreate tables
-        from app.core.database import create_tables
+                # Recreate tables on the same connection
+                create_tables(conn)
+                conn.commit()
+            finally:
+                cursor.execute(f"PRAGMA synchronous={synchronous}")
+                cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+
+        _list_tables_snapshot.cache_clear()
+        # The users table was recreated, so the cached default user id is stale
+        from app.models.user import User
 
-        create_tables()
+        User.forget_default_user()
 
         return f"✅ Database cleaned successfully! Dropped {len(tables)} tables and recreated schema."
 
@@ -58,19 +100,9 @@ def get_database_stats() -> str:
     try:
         engine = get_engine()
 
-        with engine.connect() as conn:
-            # Get table information
-            result = conn.execute(
-                text(
-                    """
-                SELECT name, 
-                       (SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name=m.name) as table_count
-                FROM sqlite_master m WHERE type='table'
-            """
-                )
-            )
-            tables = result.fetchall()
+        tables = _list_tables(engine)
 
+        with engine.connect() as conn:
             stats = "📊 Database Statistics:\n" + "=" * 30 + "\n"
 
             if not tables:
@@ -78,19 +110,39 @@ def get_database_stats() -> str:
                 return stats
 
             total_records = 0
-
-            for table_name, _ in tables:
-                if table_name == "sqlite_sequence":
-                    continue
-
+            user_tables = [name for name in tables if name != "sqlite_sequence"]
+
+            # Count every table with one UNION ALL statement, tagging each
+            # row with the table's index since row order is not guaranteed
+            counts = {}
+            if user_tables:
+                # Quote names with the dialect's identifier escaping and run
+                # the SQL through the driver directly, since text() would
+                # treat ":name" inside a table name as a bind parameter
+                quote = engine.dialect.identifier_preparer.quote_identifier
+                count_sql = " UNION ALL ".join(
+                    f"SELECT {index}, COUNT(*) FROM {quote(table_name)}"
+                    for index, table_name in enumerate(user_tables)
+                )
                 try:
-                    count_result = conn.execute(
-                        text(f"SELECT COUNT(*) FROM {table_name}")
-                    )
-                    count = count_result.fetchone()[0]
+                    counts = dict(conn.exec_driver_sql(count_sql).fetchall())
+                except Exception:
+                    # One unreadable table fails the whole statement; fall
+                    # back to counting each table on its own
+                    for index, table_name in enumerate(user_tables):
+                        try:
+                            counts[index] = conn.exec_driver_sql(
+                                f"SELECT COUNT(*) FROM {quote(table_name)}"
+                            ).scalar()
+                        except Exception:
+                            pass
+
+            for index, table_name in enumerate(user_tables):
+                if index in counts:
+                    count = counts[index]
                     total_records += count
                     stats += f"📋 {table_name}: {count} records\n"
-                except Exception:
+                else:
                     stats += f"📋 {table_name}: Error reading\n"
 
             stats += f"\n📈 Total records: {total_records}\n"
@@ -3,78 +3,366 @@ File operations functions for agent commands.
 All functions return strings (including errors) as they will be passed to the AI agent.
 """
 
+import mmap
 import os
 import re
+import shutil
+import stat
 import subprocess
-from pathlib import Path
-from typing import List, Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import (
+    List,
+    Dict,
+    Any,
+    Iterator,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+from app.functions.fileio import decode_text, open_buffer, write_text
+from app.functions.paths import (
+    relative_display_path,
+    resolve_project_path,
+    resolve_project_paths,
+)
+from app.functions.patterns import required_literal, spans_lines
+
+
+# ripgrep binary used by search_in_directory when installed, looked up once
+_RG_PATH = shutil.which("rg")
+
+# Number of file paths passed to a single rg invocation
+_RG_BATCH_SIZE = 512
+
+# Below this many candidate files, thread pool start-up costs more than it saves
+_PARALLEL_SEARCH_MIN_FILES = 50
+
+# How long a directory listing may be reused by list_files, in seconds
+_DIR_LIST_TTL = 2
+
+# Leading bytes checked for a NUL when deciding a file is binary
+_BINARY_SNIFF_SIZE = 8192
+
+# Pattern constructs that can match at a line's edges but not at the same
+# place in the whole buffer (^, $, \A, \Z, \B and negative lookarounds).
+# Without them, a whole-buffer miss rules out every line.
+_LINE_EDGE_RE = re.compile(r"[\^$]|\\[AZB]|\(\?<?!")
+
+
+# Directory names never descended into when walking a tree (VCS metadata,
+# dependency folders, virtualenvs, build output and tool caches)
+_PRUNED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "__pycache__",
+        ".venv",
+        "venv",
+        "dist",
+        "build",
+        ".mypy_cache",
+        ".pytest_cache",
+        "target",
+        ".tox",
+    }
+)
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str, flags: int) -> Pattern:
+    """Compile pattern, reusing the result for repeated searches."""
+    return re.compile(pattern, flags)
+
+
+def _required_bytes(regex: Pattern) -> bytes:
+    """
+    Return required_literal(regex) encoded for a substring check on raw file
+    bytes, lowercased when regex ignores case, or b"" when there is none.
+    """
+    literal = required_literal(regex)
+    if literal is None:
+        return b""
+    if not regex.flags & re.IGNORECASE:
+        return literal.encode("utf-8")
+    # Non-ASCII letters have case folds bytes.lower() cannot reproduce
+    if not literal.isascii():
+        return b""
+    return literal.lower().encode("ascii")
+
+
+def _may_contain(
+    data: Union[bytes, mmap.mmap], required: bytes, case_sensitive: bool
+) -> bool:
+    """Return False only when data certainly lacks the required literal."""
+    if not required:
+        return True
+    if case_sensitive:
+        return data.find(required) != -1
+    # Outside ASCII, re.IGNORECASE folds letters (e.g. U+017F to s) that
+    # bytes.lower() does not, so only ASCII data is ruled out
+    if not isinstance(data, bytes) or not data.isascii():
+        return True
+    return required in data.lower()
+
+
+def _extension_suffixes(file_extensions: Optional[List[str]]) -> Tuple[str, ...]:
+    """Normalize file_extensions to lowercase dotted suffixes for str.endswith."""
+    return tuple(
+        ext.lower() if ext.startswith(".") else "." + ext.lower()
+        for ext in file_extensions or ()
+    )
+
+
+def _iter_files(
+    root: str, extensions: Tuple[str, ...] = (), recursive: bool = True
+) -> Iterator[Tuple[str, int]]:
+    """
+    Yield (path, size) for the regular files under root.
+
+    Walks with os.scandir so each entry's type and size come from its
+    DirEntry. Directories named in _PRUNED_DIRS are not descended into,
+    symlinks are not followed and unreadable directories are skipped. An
+    empty extensions tuple matches every file.
+    """
+    stack = [root]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _PRUNED_DIRS:
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if extensions and not entry.name.lower().endswith(
+                                extensions
+                            ):
+                                continue
+                            yield entry.path, entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+        if recursive:
+            # Reversed so directories are visited in listing order
+            stack.extend(reversed(subdirs))
 
 
-def resolve_project_path(input_path: str, project_root: str = None) -> Path:
+def _rg_search(
+    paths: List[str], pattern: str, case_sensitive: bool
+) -> Optional[Dict[str, List[Tuple[int, str]]]]:
     """
-    Resolve a path relative to the project root, handling various input formats.
+    Search paths with ripgrep, returning {path: [(line_num, line), ...]}.
 
-    Args:
-        input_path: Input path that can be:
-                   - Absolute system path (/Users/name/project/file.py)
-                   - Relative to project root (/src/main.py -> project_root/src/main.py)
-                   - Relative path (src/main.py -> project_root/src/main.py)
-                   - Current directory (. or empty)
-        project_root: Project root directory (uses current dir if None)
+    Returns None when rg is not installed or fails (for example on regex
+    syntax it does not support), so the caller can fall back to Python.
+    """
+    if _RG_PATH is None:
+        return None
+
+    # Skip binary files like the Python search does; rg would otherwise
+    # report them with a "binary file matches" line
+    paths = [path for path in paths if not _is_binary(path)]
+
+    argv = [
+        _RG_PATH,
+        "--line-number",
+        "--with-filename",
+        "--no-heading",
+        "--null",
+        "--crlf",
+        "--color",
+        "never",
+        "--no-config",
+    ]
+    if not case_sensitive:
+        argv.append("-i")
+    argv += ["-e", pattern, "--"]
+
+    matches: Dict[str, List[Tuple[int, str]]] = {}
+    for start in range(0, len(paths), _RG_BATCH_SIZE):
+        try:
+            result = subprocess.run(
+                argv + paths[start : start + _RG_BATCH_SIZE],
+                capture_output=True,
+                timeout=60,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+
+        # 0 = matches found, 1 = no matches, 2 = error
+        if result.returncode > 1:
+            return None
+
+        # rg prints each file's matches together, so the match list is only
+        # looked up when the path changes
+        last_path = None
+        for raw_line in result.stdout.splitlines():
+            path, sep, rest = raw_line.partition(b"\0")
+            line_num, _, text = rest.partition(b":")
+            # Not a path\0line:text match line (e.g. a binary file notice)
+            if not sep or not line_num.isdigit():
+                continue
+            if path != last_path:
+                last_path = path
+                append = matches.setdefault(os.fsdecode(path), []).append
+            append((int(line_num), text.decode("utf-8", "ignore").rstrip()))
 
-    Returns:
-        Path object with resolved path
+    return matches
+
+
+def _is_binary(file_path: str) -> bool:
+    """Return True when a NUL in the file's first _BINARY_SNIFF_SIZE bytes."""
+    try:
+        with open(file_path, "rb") as f:
+            return b"\0" in f.read(_BINARY_SNIFF_SIZE)
+    except OSError:
+        # Left for the search itself to report
+        return False
+
+
+def _read_bytes(file_path: str, size: int) -> bytes:
+    """Read a file of known size with one os.read, hinting sequential access."""
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        # Ask for one extra byte so a single call also detects EOF
+        data = os.read(fd, size + 1)
+        if len(data) > size:
+            # The file grew since it was sized; read the rest
+            chunks = [data]
+            while True:
+                chunk = os.read(fd, 1 << 20)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            data = b"".join(chunks)
+        return data
+    finally:
+        os.close(fd)
+
+
+def _load_text(
+    file_path: str,
+    required: bytes = b"",
+    case_sensitive: bool = True,
+    skip_binary: bool = False,
+) -> Optional[str]:
     """
-    # First resolve the project_root itself using the same logic
-    if project_root:
-        project_root = project_root.strip()
+    Read and decode a file for searching, memory-mapping large files.
 
-        # Handle empty or current directory for project_root
-        if not project_root or project_root == "." or project_root == "./":
-            base_path = Path.cwd().resolve()
-        else:
-            root_path_obj = Path(project_root)
-
-            # Apply same logic to project_root
-            if root_path_obj.is_absolute():
-                # Check if it's a real absolute system path
-                if len(root_path_obj.parts) > 2 and (
-                    root_path_obj.exists()
-                    or str(root_path_obj).startswith(("/", "C:", "D:"))
-                ):
-                    base_path = root_path_obj.resolve()
-                else:
-                    # Treat as relative to current directory (remove leading slash)
-                    relative_part = str(root_path_obj).lstrip("/")
-                    base_path = (Path.cwd() / relative_part).resolve()
-            else:
-                # Regular relative path
-                base_path = (Path.cwd() / project_root).resolve()
-    else:
-        base_path = Path.cwd().resolve()
-
-    input_path = input_path.strip()
-
-    # Handle empty or current directory for input_path
-    if not input_path or input_path == "." or input_path == "./":
-        return base_path
-
-    path_obj = Path(input_path)
-
-    # Check if it's a real absolute system path (has multiple parts and exists or looks like system path)
-    if path_obj.is_absolute():
-        # If it starts with system root and has multiple parts, treat as absolute
-        if len(path_obj.parts) > 2 and (
-            path_obj.exists() or str(path_obj).startswith(("/", "C:", "D:"))
-        ):
-            return path_obj.resolve()
-        else:
-            # Treat as relative to project root (remove leading slash)
-            relative_part = str(path_obj).lstrip("/")
-            return (base_path / relative_part).resolve()
-    else:
-        # Regular relative path
-        return (base_path / input_path).resolve()
+    Returns None without decoding when the file cannot contain the
+    required literal (see _required_bytes), or when skip_binary is set
+    and a NUL byte in its first _BINARY_SNIFF_SIZE bytes marks it binary.
+    """
+    with open_buffer(file_path) as data:
+        return _filter_text(data, required, case_sensitive, skip_binary)
+
+
+def _filter_text(
+    data: Union[bytes, mmap.mmap],
+    required: bytes,
+    case_sensitive: bool,
+    skip_binary: bool,
+) -> Optional[str]:
+    """Decode data for _load_text unless it is binary or lacks required."""
+    if skip_binary and data.find(b"\0", 0, _BINARY_SNIFF_SIZE) != -1:
+        return None
+    if not _may_contain(data, required, case_sensitive):
+        return None
+    return decode_text(data)
+
+
+def _search_lines(content: str, regex: Pattern) -> List[Tuple[int, str]]:
+    """
+    Return (line_num, line) for each line of content that regex matches.
+
+    The whole buffer is scanned with a multiline copy of regex, so lines
+    are only sliced out around hits; each hit line is then confirmed with
+    regex itself to keep the per-line matching semantics.
+    """
+    pattern = regex.pattern
+    if spans_lines(regex):
+        if not _LINE_EDGE_RE.search(pattern) and not regex.search(content):
+            return []
+        return [
+            (line_num, line.rstrip())
+            for line_num, line in enumerate(content.splitlines(True), 1)
+            if regex.search(line)
+        ]
+
+    # Hot loop: bind bound methods to locals once
+    scan = _compile(pattern, regex.flags | re.MULTILINE).search
+    search = regex.search
+    rfind = content.rfind
+    find = content.find
+    count = content.count
+    matches = []
+    append = matches.append
+    length = len(content)
+    # A trailing newline ends the last line rather than starting a new one
+    limit = length - 1 if content.endswith("\n") else length
+    pos = 0
+    line_num = 1
+    line_pos = 0
+
+    while pos < length:
+        match = scan(content, pos)
+        if match is None:
+            break
+
+        hit = match.start()
+        if hit > limit:
+            break
+        start = rfind("\n", 0, hit) + 1
+        end = find("\n", hit)
+        end = length if end == -1 else end + 1
+
+        line_num += count("\n", line_pos, start)
+        line_pos = start
+
+        line = content[start:end]
+        if search(line):
+            append((line_num, line.rstrip()))
+        pos = end
+
+    return matches
+
+
+def _scan_file(
+    file_path: str, regex: Pattern, base_str: str, required: bytes = b""
+) -> Optional[List[str]]:
+    """
+    Return the formatted match lines for one file searched by regex.
+
+    Returns None when the file cannot be read as text, so it is not counted
+    as searched.
+    """
+    case_sensitive = not regex.flags & re.IGNORECASE
+    try:
+        content = _load_text(file_path, required, case_sensitive, skip_binary=True)
+    except (PermissionError, UnicodeDecodeError):
+        return None
+
+    if content is None:
+        return []
+    file_matches = _search_lines(content, regex)
+    if not file_matches:
+        return []
+    relative_path = relative_display_path(file_path, base_str)
+    return [f"{relative_path}:{line_num}: {line}" for line_num, line in file_matches]
 
 
 def read_file(file_path: str, project_root: str = None) -> str:
@@ -89,27 +377,23 @@ def read_file(file_path: str, project_root: str = None) -> str:
         String containing file contents or error message
     """
     try:
-        full_path = resolve_project_path(file_path, project_root)
+        full_path, base_path = resolve_project_paths(file_path, project_root)
 
-        if not full_path.exists():
+        # One stat answers existence, type and size
+        try:
+            file_stat = os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
             return f"Error: File '{full_path}' does not exist"
 
-        if not full_path.is_file():
+        if not stat.S_ISREG(file_stat.st_mode):
             return f"Error: '{full_path}' is not a file"
 
         # Check file size (avoid reading huge files)
-        file_size = full_path.stat().st_size
+        file_size = file_stat.st_size
         if file_size > 10 * 1024 * 1024:  # 10MB limit
             return f"Error: File '{full_path}' is too large ({file_size} bytes). Maximum size is 10MB."
 
-        with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
-
-        # Show relative path for cleaner output
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
+        content = decode_text(_read_bytes(str(full_path), file_size))
 
         try:
             display_path = full_path.relative_to(base_path)
@@ -140,7 +424,7 @@ def search_in_file(
         String with matching lines or error message
     """
     try:
-        full_path = resolve_project_path(file_path, project_root)
+        full_path, base_path = resolve_project_paths(file_path, project_root)
 
         if not full_path.exists():
             return f"Error: File '{full_path}' does not exist"
@@ -149,23 +433,23 @@ def search_in_file(
             return f"Error: '{full_path}' is not a file"
 
         flags = 0 if case_sensitive else re.IGNORECASE
-        regex = re.compile(pattern, flags)
+        regex = _compile(pattern, flags)
 
+        content = _load_text(
+            str(full_path),
+            _required_bytes(regex),
+            not regex.flags & re.IGNORECASE,
+        )
         matches = []
-        with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-            for line_num, line in enumerate(f, 1):
-                if regex.search(line):
-                    matches.append(f"{line_num}: {line.rstrip()}")
+        if content is not None:
+            matches = [
+                f"{line_num}: {line}"
+                for line_num, line in _search_lines(content, regex)
+            ]
 
         if not matches:
             return f"No matches found for pattern '{pattern}' in '{full_path}'"
 
-        # Show relative path for cleaner output
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
-
         try:
             display_path = full_path.relative_to(base_path)
         except ValueError:
@@ -204,7 +488,7 @@ def search_in_directory(
         String with search results or error message
     """
     try:
-        search_path = resolve_project_path(directory, project_root)
+        search_path, base_path = resolve_project_paths(directory, project_root)
 
         if not search_path.exists():
             return f"Error: Directory '{search_path}' does not exist"
@@ -213,51 +497,66 @@ def search_in_directory(
             return f"Error: '{search_path}' is not a directory"
 
         flags = 0 if case_sensitive else re.IGNORECASE
-        regex = re.compile(pattern, flags)
+        regex = _compile(pattern, flags)
 
         results = []
         files_searched = 0
 
-        # Get base path for relative display
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
+        base_str = str(base_path)
+        extensions = _extension_suffixes(file_extensions)
 
-        for file_path in search_path.rglob("*"):
-            if files_searched >= max_files:
-                results.append(f"\n--- Stopped after searching {max_files} files ---")
+        # Pick the files to search first, so ripgrep and the Python fallback
+        # see the same max_files-limited candidate list
+        candidates = []
+        stopped = False
+        for file_path, file_size in _iter_files(str(search_path), extensions):
+            if len(candidates) >= max_files:
+                stopped = True
                 break
 
-            if not file_path.is_file():
+            # Skip binary files and large files
+            if file_size > 1024 * 1024:  # 1MB limit for search
                 continue
 
-            # Filter by extensions if provided
-            if file_extensions and file_path.suffix.lower() not in [
-                ext.lower() for ext in file_extensions
-            ]:
-                continue
+            candidates.append(file_path)
+
+        rg_matches = _rg_search(candidates, pattern, case_sensitive)
+        if rg_matches is not None:
+            for file_path in candidates:
+                file_matches = rg_matches.get(file_path)
+                if file_matches:
+                    relative_path = relative_display_path(file_path, base_str)
+                    for line_num, line in file_matches:
+                        results.append(f"{relative_path}:{line_num}: {line}")
+            files_searched = len(candidates)
+        else:
+            # Files are independent and reading releases the GIL, so larger
+            # candidate lists are scanned on a thread pool; map keeps order
+            required = _required_bytes(regex)
+            if len(candidates) >= _PARALLEL_SEARCH_MIN_FILES:
+                workers = min(32, (os.cpu_count() or 1) * 4)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    scanned = list(
+                        executor.map(
+                            lambda file_path: _scan_file(
+                                file_path, regex, base_str, required
+                            ),
+                            candidates,
+                        )
+                    )
+            else:
+                scanned = [
+                    _scan_file(file_path, regex, base_str, required)
+                    for file_path in candidates
+                ]
 
-            # Skip binary files and large files
-            try:
-                if file_path.stat().st_size > 1024 * 1024:  # 1MB limit for search
-                    continue
-
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    for line_num, line in enumerate(f, 1):
-                        if regex.search(line):
-                            try:
-                                relative_path = file_path.relative_to(base_path)
-                            except ValueError:
-                                relative_path = file_path
-                            results.append(
-                                f"{relative_path}:{line_num}: {line.rstrip()}"
-                            )
-
-                files_searched += 1
-
-            except (PermissionError, UnicodeDecodeError):
-                continue
+            for file_results in scanned:
+                if file_results is not None:
+                    results.extend(file_results)
+                    files_searched += 1
+
+        if stopped:
+            results.append(f"\n--- Stopped after searching {max_files} files ---")
 
         if not results:
             return (
@@ -304,8 +603,10 @@ def create_file(
         # Create parent directories if they don't exist
         full_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(full_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        write_text(str(full_path), content)
+
+        # Recent listings may predate the new file
+        _list_entries.cache_clear()
 
         return f"Successfully created file: {full_path}"
 
@@ -315,6 +616,28 @@ def create_file(
         return f"Error creating file '{file_path}': {str(e)}"
 
 
+@lru_cache(maxsize=64)
+def _list_entries(
+    root: str,
+    extensions: Tuple[str, ...],
+    recursive: bool,
+    max_files: int,
+    base_str: str,
+    bucket: int,
+) -> Tuple[str, ...]:
+    """Walk root for list_files' entry lines; cached per arguments and TTL bucket."""
+    files = []
+    # Breaking out of the generator stops the directory walk as well
+    for file_path, file_size in _iter_files(root, extensions, recursive):
+        if len(files) >= max_files:
+            files.append(f"\n--- Stopped after listing {max_files} files ---")
+            break
+
+        display_path = relative_display_path(file_path, base_str)
+        files.append(f"{display_path} ({file_size} bytes)")
+    return tuple(files)
+
+
 def list_files(
     directory: str = ".",
     file_extensions: List[str] = None,
@@ -336,7 +659,7 @@ def list_files(
         String with file list or error message
     """
     try:
-        search_path = resolve_project_path(directory, project_root)
+        search_path, base_path = resolve_project_paths(directory, project_root)
 
         if not search_path.exists():
             return f"Error: Directory '{search_path}' does not exist"
@@ -344,51 +667,24 @@ def list_files(
         if not search_path.is_dir():
             return f"Error: '{search_path}' is not a directory"
 
-        files = []
-        files_count = 0
-
-        # Get base path for relative display
-        if project_root:
-            base_path = Path(project_root).resolve()
-        else:
-            base_path = Path.cwd().resolve()
-
-        if recursive:
-            pattern = "**/*"
-        else:
-            pattern = "*"
-
-        for file_path in search_path.glob(pattern):
-            if files_count >= max_files:
-                files.append(f"\n--- Stopped after listing {max_files} files ---")
-                break
-
-            if file_path.is_file():
-                # Filter by extensions if provided
-                if file_extensions and file_path.suffix.lower() not in [
-                    ext.lower() for ext in file_extensions
-                ]:
-                    continue
-
-                try:
-                    relative_path = file_path.relative_to(base_path)
-                except ValueError:
-                    relative_path = file_path
-
-                file_size = file_path.stat().st_size
-                files.append(f"{relative_path} ({file_size} bytes)")
-                files_count += 1
-
-        if not files:
-            return f"No files found in directory '{search_path}'"
-
         try:
             display_path = search_path.relative_to(base_path)
         except ValueError:
             display_path = search_path
 
-        header = f"Files in {display_path}:\n{'='*50}\n"
-        return header + "\n".join(files)
+        entries = _list_entries(
+            str(search_path),
+            _extension_suffixes(file_extensions),
+            recursive,
+            max_files,
+            str(base_path),
+            int(time.monotonic() // _DIR_LIST_TTL),
+        )
+
+        if not entries:
+            return f"No files found in directory '{search_path}'"
+
+        return "\n".join((f"Files in {display_path}:\n{'='*50}", *entries))
 
     except Exception as e:
         return f"Error listing files in directory '{directory}': {str(e)}"
@@ -0,0 +1,60 @@
+"""
+File reading and writing helpers shared by the agent functions.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+# Files at least this large are memory-mapped instead of read into memory
+MMAP_MIN_SIZE = 64 * 1024
+
+# Largest single os.write issued by write_bytes
+_WRITE_CHUNK_SIZE = 1 << 20
+
+
+@contextmanager
+def open_buffer(file_path: str) -> Iterator[Union[bytes, mmap.mmap]]:
+    """Yield a file's bytes, memory-mapping large files instead of copying them."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def decode_text(data: Union[bytes, mmap.mmap]) -> str:
+    """Decode file bytes like text-mode open() (UTF-8, universal newlines)."""
+    content = str(data, "utf-8", "ignore")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def write_bytes(file_path: str, data: bytes, append: bool = False) -> None:
+    """
+    Write data to file_path with os.write calls of up to _WRITE_CHUNK_SIZE.
+
+    The file is truncated first unless append is set. Bytes are written
+    as given; see write_text for newline translation.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    flags |= os.O_APPEND if append else os.O_TRUNC
+    fd = os.open(file_path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            # os.write may write less than asked; continue from where it stopped
+            offset += os.write(fd, view[offset : offset + _WRITE_CHUNK_SIZE])
+    finally:
+        os.close(fd)
+
+
+def write_text(file_path: str, text: str, append: bool = False) -> None:
+    """Write text as UTF-8 with the platform's line endings, like text-mode open()."""
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    write_bytes(file_path, text.encode("utf-8"), append)
@@ -3,10 +3,268 @@ Git operations functions for version control commands.
 All functions return strings as they will be passed to the AI agent.
 """
 
+import re
 import subprocess
 import os
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+try:
+    import pygit2
+except ImportError:  # Optional: git queries fall back to the git CLI
+    pygit2 = None
+
+# Seconds any git command may run; AGENT_GIT_TIMEOUT raises it for large
+# repositories or slow filesystems
+try:
+    _GIT_TIMEOUT = float(os.environ.get("AGENT_GIT_TIMEOUT", "60"))
+except ValueError:
+    _GIT_TIMEOUT = 60.0
+
+# Diffs longer than MAX_CHARS are cut to their first MAX_LINES lines
+_STAGED_DIFF_MAX_CHARS = 5000
+_STAGED_DIFF_MAX_LINES = 100
+_REVIEW_DIFF_MAX_CHARS = 8000
+_REVIEW_DIFF_MAX_LINES = 150
+
+# How long a staged-changes sighting lets execute_git_commit skip its check,
+# in seconds
+_STAGED_STATE_TTL = 5
+
+# First line of `git commit` output, e.g. "[main (root-commit) 1a2b3c4] Message"
+_COMMIT_SUMMARY_RE = re.compile(r"\[[^\]\n]* ([0-9a-f]{4,})\] ")
+
+
+def _working_dir(project_root: Optional[str]) -> str:
+    """Return the directory git runs in: project_root, or the current one."""
+    return os.path.abspath(project_root) if project_root else os.getcwd()
+
+
+# Work-tree top level found for each working directory. Only hits are kept,
+# so a directory turned into a repository later is still noticed.
+_repo_roots: Dict[str, str] = {}
+
+
+# When get_git_status or get_staged_files last saw staged changes, per
+# working directory (time.monotonic())
+_staged_seen: Dict[str, float] = {}
+
+
+def _note_staged(cwd: str, has_staged: bool) -> None:
+    """Record whether cwd's index was just seen holding staged changes."""
+    if has_staged:
+        _staged_seen[cwd] = time.monotonic()
+    else:
+        _staged_seen.pop(cwd, None)
+
+
+def _resolve_repo_root(cwd: str) -> Optional[str]:
+    """Return the work-tree top level containing cwd, or None outside a repo."""
+    root = _repo_roots.get(cwd)
+    if root is None:
+        result = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=_GIT_TIMEOUT,
+        )
+        if result.returncode != 0:
+            return None
+        root = _repo_roots[cwd] = result.stdout.strip()
+    return root
+
+
+# pygit2 repositories opened for each working directory (None: no repository)
+_pygit2_repos: Dict[str, Any] = {}
+
+
+def _open_pygit2_repo(cwd: str):
+    """Return an in-process pygit2 Repository for cwd, or None to use the CLI."""
+    if pygit2 is None:
+        return None
+    if cwd not in _pygit2_repos:
+        repo = None
+        try:
+            repo_path = pygit2.discover_repository(cwd)
+            if repo_path is not None:
+                repo = pygit2.Repository(repo_path)
+                if repo.is_bare:
+                    repo = None
+        except pygit2.GitError:
+            repo = None
+        if repo is None:
+            # Not cached, so a repository created later is still picked up
+            return None
+        _pygit2_repos[cwd] = repo
+    return _pygit2_repos[cwd]
+
+
+def _pygit2_status_lines(cwd: str) -> Optional[List[str]]:
+    """
+    Return `git status --porcelain` style "XY path" lines read with pygit2.
+
+    Returns None when pygit2 is unavailable or fails, so callers run git.
+    Renames are reported as an add plus a delete, as libgit2 status does
+    not pair them.
+    """
+    repo = _open_pygit2_repo(cwd)
+    if repo is None:
+        return None
+    try:
+        status = repo.status(untracked_files="normal")
+    except pygit2.GitError:
+        return None
+
+    flags = pygit2.enums.FileStatus
+    lines = []
+    for path in sorted(status):
+        state = status[path]
+        if state & flags.CONFLICTED:
+            lines.append(f"UU {path}")
+            continue
+        if state & flags.WT_NEW:
+            lines.append(f"?? {path}")
+            continue
+
+        if state & flags.INDEX_NEW:
+            staged = "A"
+        elif state & flags.INDEX_MODIFIED:
+            staged = "M"
+        elif state & flags.INDEX_DELETED:
+            staged = "D"
+        elif state & flags.INDEX_RENAMED:
+            staged = "R"
+        elif state & flags.INDEX_TYPECHANGE:
+            staged = "T"
+        else:
+            staged = " "
+
+        if state & flags.WT_MODIFIED:
+            unstaged = "M"
+        elif state & flags.WT_DELETED:
+            unstaged = "D"
+        elif state & flags.WT_TYPECHANGE:
+            unstaged = "T"
+        else:
+            unstaged = " "
+
+        lines.append(f"{staged}{unstaged} {path}")
+    return lines
+
+
+def _pygit2_staged_patch(cwd: str, max_chars: int, max_lines: int) -> Optional[str]:
+    """
+    Return the `git diff --cached` patch read with pygit2.
+
+    Like _run_diff, file patches are only rendered until the text is known
+    to need truncating to max_lines lines. Returns None when pygit2 is
+    unavailable or fails (including before the first commit, when HEAD does
+    not resolve), so callers run git.
+    """
+    repo = _open_pygit2_repo(cwd)
+    if repo is None:
+        return None
+    try:
+        # The cached repository keeps its index loaded; pick up `git add`s
+        repo.index.read(False)
+        diff = repo.diff("HEAD", cached=True)
+        # git diff detects renames by default; libgit2 only on request
+        diff.find_similar()
+        parts = []
+        size = 0
+        content_end = 0
+        line_count = 0
+        for patch in diff:
+            text = patch.text or ""
+            parts.append(text)
+            if text.strip():
+                content_end = size + len(text.rstrip())
+            size += len(text)
+            line_count += text.count("\n")
+            if line_count >= max_lines and content_end > max_chars:
+                break
+        return "".join(parts)
+    except (KeyError, ValueError, pygit2.GitError):
+        return None
+
+
+def _run_diff(
+    args: List[str], cwd: str, max_chars: int, max_lines: int, timeout: float
+) -> subprocess.CompletedProcess:
+    """
+    Run a git diff command like subprocess.run, reading only what the
+    caller's truncation can use.
+
+    Once the output is known to be longer than max_chars (ignoring trailing
+    whitespace, as the callers strip it) and max_lines lines have been read,
+    git is stopped and the lines read so far are returned with returncode 0.
+    Raises subprocess.TimeoutExpired when git runs longer than timeout.
+    """
+    # stderr goes to a file so a chatty git cannot block on a full pipe
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(
+            args, cwd=cwd, stdout=subprocess.PIPE, stderr=stderr_file, text=True
+        )
+        timed_out = threading.Event()
+
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, kill_on_timeout)
+        timer.start()
+        lines = []
+        size = 0
+        # Offset just past the last non-whitespace character read
+        content_end = 0
+        cut = False
+        try:
+            for line in proc.stdout:
+                lines.append(line)
+                if line.strip():
+                    content_end = size + len(line.rstrip())
+                size += len(line)
+                if len(lines) >= max_lines and content_end > max_chars:
+                    cut = True
+                    break
+        finally:
+            proc.stdout.close()
+            if cut:
+                proc.terminate()
+            proc.wait()
+            timer.cancel()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(args, timeout)
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors="replace")
+
+    returncode = 0 if cut else proc.returncode
+    return subprocess.CompletedProcess(args, returncode, "".join(lines), stderr)
+
+
+def _parse_status_z(output: str) -> List[str]:
+    """
+    Turn `git status -z --porcelain=v1` output into "XY path" lines.
+
+    Records are NUL-terminated and paths are not quoted, so names with
+    spaces or newlines come through intact. A rename or copy record is
+    followed by its source path, which is folded back into the
+    "XY source -> path" form of the newline-separated output.
+    """
+    lines = []
+    records = iter(output.split("\0"))
+    for record in records:
+        if not record:
+            continue
+        if "R" in record[:2] or "C" in record[:2]:
+            record = f"{record[:3]}{next(records, '')} -> {record[3:]}"
+        lines.append(record)
+    return lines
 
 
 def check_git_repository(project_root: str = None) -> str:
@@ -20,32 +278,58 @@ def check_git_repository(project_root: str = None) -> str:
         String with git repository status
     """
     try:
-        if project_root:
-            os.chdir(project_root)
+        cwd = _working_dir(project_root)
 
+        # One rev-parse answers "is this a work tree", "where is its top
+        # level" and "which branch"
         result = subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
+            [
+                "git",
+                "rev-parse",
+                "--is-inside-work-tree",
+                "--show-toplevel",
+                "--abbrev-ref",
+                "HEAD",
+            ],
+            cwd=cwd,
             capture_output=True,
             text=True,
-            timeout=10,
+            timeout=_GIT_TIMEOUT,
         )
+        rev_parse_lines = result.stdout.split("\n")
+
+        if rev_parse_lines[0] == "true":
+            _repo_roots[cwd] = rev_parse_lines[1]
 
-        if result.returncode == 0:
             # Get repository info
             repo_info = subprocess.run(
-                ["git", "remote", "-v"], capture_output=True, text=True, timeout=10
-            )
-
-            branch_info = subprocess.run(
-                ["git", "branch", "--show-current"],
+                ["git", "remote", "-v"],
+                cwd=cwd,
                 capture_output=True,
                 text=True,
-                timeout=10,
+                timeout=_GIT_TIMEOUT,
             )
 
-            current_branch = (
-                branch_info.stdout.strip() if branch_info.returncode == 0 else "unknown"
-            )
+            if result.returncode == 0:
+                # A detached HEAD abbreviates to "HEAD" and has no branch name
+                current_branch = rev_parse_lines[2]
+                if current_branch == "HEAD":
+                    current_branch = ""
+            else:
+                # HEAD does not resolve yet (no commits); ask for the branch name
+                branch_info = subprocess.run(
+                    ["git", "branch", "--show-current"],
+                    cwd=cwd,
+                    capture_output=True,
+                    text=True,
+                    timeout=_GIT_TIMEOUT,
+                )
+                current_branch = (
+                    branch_info.stdout.strip()
+                    if branch_info.returncode == 0
+                    else "unknown"
+                )
+
             remote_info = (
                 repo_info.stdout.strip() if repo_info.returncode == 0 else "No remotes"
             )
@@ -73,31 +357,29 @@ def get_git_status(project_root: str = None) -> str:
         String with git status information
     """
     try:
-        if project_root:
-            os.chdir(project_root)
+        cwd = _working_dir(project_root)
 
         # Check if it's a git repo first
-        repo_check = subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-
-        if repo_check.returncode != 0:
+        if _resolve_repo_root(cwd) is None:
             return "❌ Not a git repository"
 
-        # Get git status
-        result = subprocess.run(
-            ["git", "status", "--porcelain"], capture_output=True, text=True, timeout=10
-        )
+        # Get git status, in process when pygit2 is installed
+        status_lines = _pygit2_status_lines(cwd)
+        if status_lines is None:
+            result = subprocess.run(
+                ["git", "status", "-z", "--porcelain=v1"],
+                cwd=cwd,
+                capture_output=True,
+                text=True,
+                timeout=_GIT_TIMEOUT,
+            )
 
-        if result.returncode != 0:
-            return f"❌ Git status failed: {result.stderr}"
+            if result.returncode != 0:
+                return f"❌ Git status failed: {result.stderr}"
 
-        status_lines = result.stdout.strip().split("\n")
+            status_lines = _parse_status_z(result.stdout)
 
-        if not status_lines or status_lines == [""]:
+        if not status_lines:
             return "✅ Working directory clean - no changes to commit"
 
         staged_files = []
@@ -105,9 +387,6 @@ def get_git_status(project_root: str = None) -> str:
         untracked_files = []
 
         for line in status_lines:
-            if len(line) < 3:
-                continue
-
             status_code = line[:2]
             filename = line[3:]
 
@@ -125,6 +404,8 @@ def get_git_status(project_root: str = None) -> str:
             elif status_code == "??":
                 untracked_files.append(f"? {filename}")
 
+        _note_staged(cwd, bool(staged_files))
+
         # Format output
         output = "📋 Git Status Summary:\n" + "=" * 30 + "\n"
 
@@ -153,37 +434,37 @@ def get_git_status(project_root: str = None) -> str:
         return f"❌ Error getting git status: {str(e)}"
 
 
-def get_staged_files() -> str:
+def get_staged_files(project_root: str = None) -> str:
     """
     Get list of staged files ready for commit.
 
+    Args:
+        project_root: Project root directory
+
     Returns:
         String with staged files information
     """
     try:
-        # Check if it's a git repo first
-        repo_check = subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
+        cwd = _working_dir(project_root)
 
-        if repo_check.returncode != 0:
+        # Check if it's a git repo first
+        if _resolve_repo_root(cwd) is None:
             return "❌ Not a git repository"
 
         # Get staged files
         result = subprocess.run(
             ["git", "diff", "--cached", "--name-status"],
+            cwd=cwd,
             capture_output=True,
             text=True,
-            timeout=10,
+            timeout=_GIT_TIMEOUT,
         )
 
         if result.returncode != 0:
             return f"❌ Git diff failed: {result.stderr}"
 
         staged_lines = result.stdout.strip().split("\n")
+        _note_staged(cwd, staged_lines != [""])
 
         if not staged_lines or staged_lines == [""]:
             return "❌ No files in staging area. Use 'git add <files>' to stage files for commit."
@@ -215,31 +496,45 @@ def get_staged_files() -> str:
         return f"❌ Error getting staged files: {str(e)}"
 
 
-def get_staged_diff() -> str:
+def get_staged_diff(project_root: str = None) -> str:
     """
     Get the diff of staged changes for AI analysis.
 
+    Args:
+        project_root: Project root directory
+
     Returns:
         String with staged diff content
     """
     try:
-        # Get staged diff
-        result = subprocess.run(
-            ["git", "diff", "--cached"], capture_output=True, text=True, timeout=30
+        cwd = _working_dir(project_root)
+
+        # Get staged diff, in process when pygit2 is installed
+        diff_content = _pygit2_staged_patch(
+            cwd, _STAGED_DIFF_MAX_CHARS, _STAGED_DIFF_MAX_LINES
         )
+        if diff_content is None:
+            result = _run_diff(
+                ["git", "diff", "--cached"],
+                cwd,
+                _STAGED_DIFF_MAX_CHARS,
+                _STAGED_DIFF_MAX_LINES,
+                timeout=_GIT_TIMEOUT,
+            )
 
-        if result.returncode != 0:
-            return f"❌ Git diff failed: {result.stderr}"
+            if result.returncode != 0:
+                return f"❌ Git diff failed: {result.stderr}"
 
-        diff_content = result.stdout.strip()
+            diff_content = result.stdout
+        diff_content = diff_content.strip()
 
         if not diff_content:
             return "❌ No staged changes found"
 
         # Limit diff size for AI processing
-        if len(diff_content) > 5000:
+        if len(diff_content) > _STAGED_DIFF_MAX_CHARS:
             lines = diff_content.split("\n")
-            limited_diff = "\n".join(lines[:100])  # First 100 lines
+            limited_diff = "\n".join(lines[:_STAGED_DIFF_MAX_LINES])
             return f"{limited_diff}\n\n... (diff truncated for AI analysis)"
 
         return diff_content
@@ -250,48 +545,72 @@ def get_staged_diff() -> str:
         return f"❌ Error getting staged diff: {str(e)}"
 
 
-def execute_git_commit(commit_message: str) -> str:
+def _has_staged_changes(cwd: str) -> bool:
+    """Return whether the index differs from HEAD."""
+    staged_check = subprocess.run(
+        ["git", "diff", "--cached", "--quiet"],
+        cwd=cwd,
+        capture_output=True,
+        timeout=_GIT_TIMEOUT,
+    )
+    return staged_check.returncode != 0
+
+
+def execute_git_commit(commit_message: str, project_root: str = None) -> str:
     """
     Execute git commit with the provided message.
 
     Args:
         commit_message: The commit message to use
+        project_root: Project root directory
 
     Returns:
         String with commit result
     """
     try:
-        # Check if there are staged files
-        staged_check = subprocess.run(
-            ["git", "diff", "--cached", "--quiet"], capture_output=True, timeout=10
-        )
+        cwd = _working_dir(project_root)
 
-        if staged_check.returncode == 0:
+        # Check if there are staged files, unless a status or staged-files
+        # call has just seen some (the usual review-then-commit flow)
+        seen = _staged_seen.pop(cwd, None)
+        checked = seen is None or time.monotonic() - seen > _STAGED_STATE_TTL
+        if checked and not _has_staged_changes(cwd):
             return "❌ No staged changes to commit"
 
         # Execute commit
         result = subprocess.run(
             ["git", "commit", "-m", commit_message],
+            cwd=cwd,
             capture_output=True,
             text=True,
-            timeout=30,
+            timeout=_GIT_TIMEOUT,
         )
 
         if result.returncode == 0:
-            # Get commit hash
-            hash_result = subprocess.run(
-                ["git", "rev-parse", "--short", "HEAD"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-
-            commit_hash = (
-                hash_result.stdout.strip() if hash_result.returncode == 0 else "unknown"
-            )
+            # git commit's summary line already names the short hash
+            hash_match = _COMMIT_SUMMARY_RE.match(result.stdout)
+            if hash_match:
+                commit_hash = hash_match.group(1)
+            else:
+                hash_result = subprocess.run(
+                    ["git", "rev-parse", "--short", "HEAD"],
+                    cwd=cwd,
+                    capture_output=True,
+                    text=True,
+                    timeout=_GIT_TIMEOUT,
+                )
+
+                commit_hash = (
+                    hash_result.stdout.strip()
+                    if hash_result.returncode == 0
+                    else "unknown"
+                )
 
             return f"✅ Commit successful!\nCommit hash: {commit_hash}\n\nCommit details:\n{result.stdout}"
         else:
+            # The index may have been emptied since it was last seen
+            if not checked and not _has_staged_changes(cwd):
+                return "❌ No staged changes to commit"
             return f"❌ Commit failed: {result.stderr}"
 
     except subprocess.TimeoutExpired:
@@ -300,22 +619,26 @@ def execute_git_commit(commit_message: str) -> str:
         return f"❌ Error executing commit: {str(e)}"
 
 
-def get_recent_commits(count: int = 5) -> str:
+def get_recent_commits(count: int = 5, project_root: str = None) -> str:
     """
     Get recent commit history for context.
 
     Args:
         count: Number of recent commits to show
+        project_root: Project root directory
 
     Returns:
         String with recent commit history
     """
     try:
+        # "<short hash> <subject>" as --oneline prints it, without the ref
+        # decorations that make git look up every branch and tag
         result = subprocess.run(
-            ["git", "log", f"-{count}", "--oneline", "--decorate"],
+            ["git", "log", f"-{count}", "--pretty=format:%h %s", "--no-color"],
+            cwd=_working_dir(project_root),
             capture_output=True,
             text=True,
-            timeout=10,
+            timeout=_GIT_TIMEOUT,
         )
 
         if result.returncode == 0:
@@ -333,17 +656,26 @@ def get_recent_commits(count: int = 5) -> str:
         return f"❌ Error getting commit history: {str(e)}"
 
 
-def get_all_changes_diff() -> str:
+def get_all_changes_diff(project_root: str = None) -> str:
     """
     Get the diff of all changes (staged and unstaged) for code review.
 
+    Args:
+        project_root: Project root directory
+
     Returns:
         String with complete diff content
     """
     try:
+        cwd = _working_dir(project_root)
+
         # Get both staged and unstaged changes
-        result = subprocess.run(
-            ["git", "diff", "HEAD"], capture_output=True, text=True, timeout=30
+        result = _run_diff(
+            ["git", "diff", "HEAD"],
+            cwd,
+            _REVIEW_DIFF_MAX_CHARS,
+            _REVIEW_DIFF_MAX_LINES,
+            timeout=_GIT_TIMEOUT,
         )
 
         if result.returncode != 0:
@@ -353,19 +685,30 @@ def get_all_changes_diff() -> str:
 
         if not diff_content:
             # Try to get staged changes if no HEAD diff
-            staged_result = subprocess.run(
-                ["git", "diff", "--cached"], capture_output=True, text=True, timeout=30
+            staged_diff = _pygit2_staged_patch(
+                cwd, _REVIEW_DIFF_MAX_CHARS, _REVIEW_DIFF_MAX_LINES
             )
-
-            if staged_result.returncode == 0 and staged_result.stdout.strip():
-                diff_content = staged_result.stdout.strip()
+            if staged_diff is None:
+                staged_result = _run_diff(
+                    ["git", "diff", "--cached"],
+                    cwd,
+                    _REVIEW_DIFF_MAX_CHARS,
+                    _REVIEW_DIFF_MAX_LINES,
+                    timeout=_GIT_TIMEOUT,
+                )
+                staged_diff = (
+                    staged_result.stdout if staged_result.returncode == 0 else ""
+                )
+
+            if staged_diff.strip():
+                diff_content = staged_diff.strip()
             else:
                 return "❌ No changes found to review"
 
         # Limit diff size for AI processing
-        if len(diff_content) > 8000:
+        if len(diff_content) > _REVIEW_DIFF_MAX_CHARS:
             lines = diff_content.split("\n")
-            limited_diff = "\n".join(lines[:150])  # First 150 lines
+            limited_diff = "\n".join(lines[:_REVIEW_DIFF_MAX_LINES])
             return f"{limited_diff}\n\n... (diff truncated for review analysis)"
 
         return diff_content
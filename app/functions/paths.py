@@ -0,0 +1,107 @@
+"""
+Project path resolution shared by the agent functions.
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+# Absolute system paths: an absolute path with at least two components
+# ("/home/x", not "/src"); anything else is taken relative to the root
+if os.name == "nt":
+    _ABS_RE = re.compile(r"^[A-Za-z]:[\\/]+[^\\/]+[\\/]+[^\\/]")
+else:
+    _ABS_RE = re.compile(r"^/+[^/]+/+[^/]")
+_LEAD_SLASH_RE = re.compile(r"^/+")
+
+
+class ResolvedPaths(NamedTuple):
+    """A resolved path and the project root it was resolved against."""
+
+    full_path: Path
+    base_path: Path
+
+
+def resolve_project_path(input_path: str, project_root: str = None) -> Path:
+    """
+    Resolve a path relative to the project root, handling various input formats.
+
+    Args:
+        input_path: Input path that can be:
+                   - Absolute system path (/Users/name/project/file.py)
+                   - Relative to project root (/src/main.py -> project_root/src/main.py)
+                   - Relative path (src/main.py -> project_root/src/main.py)
+                   - Current directory (. or empty)
+        project_root: Project root directory (uses current dir if None)
+
+    Returns:
+        Path object with resolved path
+    """
+    return resolve_project_paths(input_path, project_root).full_path
+
+
+def resolve_project_paths(
+    input_path: str, project_root: str = None
+) -> ResolvedPaths:
+    """
+    Resolve a path like resolve_project_path, also returning the resolved root.
+
+    Callers use base_path to build display paths without resolving the
+    project root a second time. Results are cached per working directory.
+    """
+    return _resolve_project_paths(input_path, project_root, os.getcwd())
+
+
+@lru_cache(maxsize=1024)
+def _resolve_project_paths(
+    input_path: str, project_root: Optional[str], cwd: str
+) -> ResolvedPaths:
+    """Resolve input_path against project_root, with cwd as the fallback base."""
+    # First resolve the project_root itself using the same logic, on plain
+    # strings with a single realpath call
+    project_root = project_root.strip() if project_root else ""
+
+    # Handle empty or current directory for project_root
+    if not project_root or project_root == "." or project_root == "./":
+        base_str = os.path.realpath(cwd)
+    elif _ABS_RE.match(project_root):
+        # A real absolute system path
+        base_str = os.path.realpath(project_root)
+    else:
+        # Relative to the current directory (a leading slash is dropped)
+        base_str = os.path.realpath(
+            os.path.join(cwd, _LEAD_SLASH_RE.sub("", project_root))
+        )
+    base_path = Path(base_str)
+
+    input_path = input_path.strip()
+
+    # Handle empty or current directory for input_path
+    if not input_path or input_path == "." or input_path == "./":
+        return ResolvedPaths(base_path, base_path)
+
+    if _ABS_RE.match(input_path):
+        # A real absolute system path
+        full_str = os.path.realpath(input_path)
+    else:
+        # Relative to the project root (a leading slash is dropped)
+        full_str = os.path.realpath(
+            os.path.join(base_str, _LEAD_SLASH_RE.sub("", input_path))
+        )
+    return ResolvedPaths(Path(full_str), base_path)
+
+
+def relative_display_path(path, base_str: str) -> str:
+    """Return path relative to base_str when it lies inside it, else in full."""
+    path_str = str(path)
+    try:
+        rel_path = os.path.relpath(path_str, base_str)
+    except ValueError:
+        # On another Windows drive than base_str
+        return path_str
+    if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+        return path_str
+    return rel_path
@@ -0,0 +1,62 @@
+"""
+Regex helpers shared by the search functions.
+"""
+
+import re
+from typing import Optional, Pattern
+
+try:
+    import re._parser as _sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse as _sre_parse
+
+# Shortest literal worth checking for before running a regex on a file
+_MIN_LITERAL_LEN = 3
+
+# Pattern constructs that can match a newline or depend on string edges
+# (\s, \W, \D, \n, escapes by code point, negated classes, inline DOTALL,
+# \A, \Z, \B, negative lookarounds). Such patterns behave differently on a
+# whole buffer than on single lines, so they are matched line by line.
+_LINE_BOUND_RE = re.compile(r"\\[sWDnrxuUN0-9AZB]|\[\^|\(\?[aiLmux]*s|\(\?<?!|[\n\r]")
+
+
+def required_literal(regex: Pattern) -> Optional[str]:
+    """
+    Return the longest literal run that every match of regex must contain.
+
+    Only top-level literal characters are considered, so anything inside
+    groups, alternations or repeats is ignored, and newlines end a run so
+    the literal also holds for CRLF files. The run is returned as written;
+    callers compare it case-insensitively when regex has re.IGNORECASE.
+    Returns None when no run of at least _MIN_LITERAL_LEN characters exists.
+    """
+    if not isinstance(regex.pattern, str):
+        return None
+
+    try:
+        parsed = _sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return None
+
+    longest = ""
+    run = []
+    for op, arg in parsed:
+        if op == _sre_parse.LITERAL and chr(arg) not in "\r\n":
+            run.append(chr(arg))
+            continue
+        if len(run) > len(longest):
+            longest = "".join(run)
+        run = []
+    if len(run) > len(longest):
+        longest = "".join(run)
+
+    return longest if len(longest) >= _MIN_LITERAL_LEN else None
+
+
+def spans_lines(regex: Pattern) -> bool:
+    """True when regex may match across a newline or needs line-local edges."""
+    return (
+        not isinstance(regex.pattern, str)
+        or bool(regex.flags & re.DOTALL)
+        or _LINE_BOUND_RE.search(regex.pattern) is not None
+    )
@@ -3,81 +3,389 @@ Project structure analysis functions for agent commands.
 All functions return strings as they will be passed to the AI agent.
 """
 
+import fnmatch
 import os
-from pathlib import Path
-from typing import List, Dict, Set
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Iterator, List, Dict, Optional, Set, Tuple
 from collections import defaultdict
 
+from app.functions.paths import resolve_project_path
+
+
+# Default ignore patterns for get_project_structure
+_STRUCTURE_IGNORE_PATTERNS = [
+    ".git",
+    ".gitignore",
+    "__pycache__",
+    "*.pyc",
+    "node_modules",
+    ".DS_Store",
+    ".vscode",
+    ".idea",
+    "venv",
+    "env",
+    ".env",
+    "dist",
+    "build",
+]
+
+# Default ignore patterns for analyze_project_languages
+_LANGUAGE_IGNORE_PATTERNS = [
+    ".git",
+    "__pycache__",
+    "node_modules",
+    ".DS_Store",
+    "venv",
+    "env",
+    "dist",
+    "build",
+]
+
+# Language mapping
+_LANGUAGE_MAP = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".ts": "TypeScript",
+    ".jsx": "React JSX",
+    ".tsx": "React TSX",
+    ".html": "HTML",
+    ".css": "CSS",
+    ".scss": "SCSS",
+    ".sass": "Sass",
+    ".json": "JSON",
+    ".yml": "YAML",
+    ".yaml": "YAML",
+    ".md": "Markdown",
+    ".txt": "Text",
+    ".sh": "Shell Script",
+    ".sql": "SQL",
+    ".java": "Java",
+    ".cpp": "C++",
+    ".c": "C",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".php": "PHP",
+    ".rb": "Ruby",
+    ".swift": "Swift",
+    ".kt": "Kotlin",
+    ".dart": "Dart",
+    ".r": "R",
+    ".scala": "Scala",
+    ".clj": "Clojure",
+    ".dockerfile": "Dockerfile",
+    ".env": "Environment",
+    ".toml": "TOML",
+    ".xml": "XML",
+    ".vue": "Vue.js",
+}
+
+# Glob patterns for important files, matched case-insensitively. All of them
+# match names in the project root except _GITHUB_PATTERN, which matches every
+# file below .github
+_IMPORTANT_PATTERNS = {
+    "Documentation": [
+        "readme*",
+        "changelog*",
+        "license*",
+        "authors*",
+        "contributors*",
+    ],
+    "Configuration": [
+        "*.json",
+        "*.yml",
+        "*.yaml",
+        "*.toml",
+        "*.ini",
+        "*.cfg",
+        ".env*",
+    ],
+    "Build/Deploy": [
+        "makefile",
+        "dockerfile*",
+        "*.sh",
+        "requirements.txt",
+        "package.json",
+        "setup.py",
+        "pyproject.toml",
+    ],
+    "Version Control": [".gitignore", ".gitattributes"],
+    "CI/CD": [".github/**/*", ".gitlab-ci.yml", "jenkinsfile*", "*.yml"],
+}
+_GITHUB_PATTERN = ".github/**/*"
+
+# Every root pattern as an optional lookahead group, so one match() of a file
+# name reports each pattern it satisfies; _IMPORTANT_CATEGORIES holds the
+# category of each group. A name may count under several categories (or
+# twice in one), as it did when every pattern was globbed separately
+_IMPORTANT_CATEGORIES = tuple(
+    category
+    for category, patterns in _IMPORTANT_PATTERNS.items()
+    for pattern in patterns
+    if pattern != _GITHUB_PATTERN
+)
+_IMPORTANT_RE = re.compile(
+    "".join(
+        f"(?=({fnmatch.translate(pattern)}))?"
+        for patterns in _IMPORTANT_PATTERNS.values()
+        for pattern in patterns
+        if pattern != _GITHUB_PATTERN
+    ),
+    re.IGNORECASE,
+)
+
+
+# Characters that make an ignore pattern a glob rather than a plain name
+_GLOB_CHARS_RE = re.compile(r"[*?\[]")
+
+
+@lru_cache(maxsize=32)
+def _ignore_matcher(patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    """
+    Return a test of a single file or directory name against ignore patterns.
 
-def resolve_project_path(input_path: str, project_root: str = None) -> Path:
+    A pattern matches whole names, exactly or as a case-sensitive glob
+    ("*.pyc"), so ".git" no longer hides ".github" and "env" no longer hides
+    "environment.py". Plain names are looked up in a set and all globs are
+    tried with one compiled alternation.
     """
-    Resolve a path relative to the project root, handling various input formats.
+    names = frozenset(p for p in patterns if not _GLOB_CHARS_RE.search(p))
+    globs = [p for p in patterns if p not in names]
+    if not globs:
+        return names.__contains__
 
-    Args:
-        input_path: Input path that can be:
-                   - Absolute system path (/Users/name/project/file.py)
-                   - Relative to project root (/src/main.py -> project_root/src/main.py)
-                   - Relative path (src/main.py -> project_root/src/main.py)
-                   - Current directory (. or empty)
-        project_root: Project root directory (uses current dir if None)
+    glob_re = re.compile("|".join(fnmatch.translate(p) for p in globs))
 
-    Returns:
-        Path object with resolved path
+    def ignored(name: str) -> bool:
+        return name in names or glob_re.match(name) is not None
+
+    return ignored
+
+
+# Example files listed per language by analyze_project_languages
+_LANGUAGE_EXAMPLES = 5
+
+
+@dataclass
+class LanguageStats:
+    """File count, total size and first example files of one language."""
+
+    count: int = 0
+    size: int = 0
+    # Only the first _LANGUAGE_EXAMPLES paths are kept
+    files: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ProjectScan:
+    """Everything one _walk_project pass collected, per report."""
+
+    # Tree lines, starting with the root line
+    tree_lines: List[str] = field(default_factory=list)
+    # Error that cut the tree short; get_project_structure reports it
+    tree_error: Optional[OSError] = None
+    # (relative path, name, size) of each counted file, in rglob order
+    language_files: List[Tuple[str, str, int]] = field(default_factory=list)
+    # Category -> (relative path, size), once per pattern that matched
+    important_files: Dict[str, List[Tuple[str, int]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+
+
+def _walk_project(
+    base_str: str,
+    max_depth: int = 5,
+    structure_ignore: Optional[List[str]] = None,
+    language_ignore: Optional[List[str]] = None,
+    important: bool = False,
+) -> ProjectScan:
+    """
+    Collect the structure tree, the language files and the important files
+    of base_str with a single os.scandir per directory.
+
+    A report is only gathered when asked for (its ignore list given, or
+    important set), and a directory is only listed while some report still
+    needs it. Each report keeps the traversal of its own former walk: the
+    tree is sorted with directories first, stops at max_depth and follows
+    symlinked directories; language files come in rglob order and symlinked
+    directories are not entered; important files are matched against the
+    root's names and everything below .github.
     """
-    # First resolve the project_root itself using the same logic
-    if project_root:
-        project_root = project_root.strip()
+    scan = ProjectScan()
+    prefix_len = len(os.path.join(base_str, ""))
+
+    # Ignored directories are never entered, so testing each entry's own
+    # name covers every component of its path below the root
+    tree_ignored = language_ignored = None
+    if structure_ignore is not None:
+        tree_ignored = _ignore_matcher(tuple(structure_ignore))
+    if language_ignore is not None:
+        language_ignored = _ignore_matcher(tuple(language_ignore))
+
+    def visit(
+        path: str, prefix: str, depth: int, tree: bool, langs: bool
+    ) -> Tuple[List[str], Optional[OSError]]:
+        """List path once; return its tree lines and any error ending them."""
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except PermissionError:
+            return [f"{prefix}└── [Permission Denied]"], None
+        except OSError as e:
+            return [], e
+
+        if depth == 0 and important:
+            for entry in entries:
+                _match_important(entry, scan.important_files)
+
+        # Subdirectories to descend into for the language report
+        lang_dirs = set()
+        if langs:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not language_ignored(entry.name):
+                            lang_dirs.add(entry.name)
+                    elif entry.is_file() and not language_ignored(entry.name):
+                        scan.language_files.append(
+                            (entry.path[prefix_len:], entry.name, entry.stat().st_size)
+                        )
+                except OSError:
+                    continue
 
-        # Handle empty or current directory for project_root
-        if not project_root or project_root == "." or project_root == "./":
-            base_path = Path.cwd().resolve()
-        else:
-            root_path_obj = Path(project_root)
-
-            # Apply same logic to project_root
-            if root_path_obj.is_absolute():
-                # Check if it's a real absolute system path
-                if len(root_path_obj.parts) > 2 and (
-                    root_path_obj.exists()
-                    or str(root_path_obj).startswith(("/", "C:", "D:"))
-                ):
-                    base_path = root_path_obj.resolve()
-                else:
-                    # Treat as relative to current directory (remove leading slash)
-                    relative_part = str(root_path_obj).lstrip("/")
-                    base_path = (Path.cwd() / relative_part).resolve()
-            else:
-                # Regular relative path
-                base_path = (Path.cwd() / project_root).resolve()
-    else:
-        base_path = Path.cwd().resolve()
-
-    input_path = input_path.strip()
-
-    # Handle empty or current directory for input_path
-    if not input_path or input_path == "." or input_path == "./":
-        return base_path
-
-    path_obj = Path(input_path)
-
-    # Check if it's a real absolute system path (has multiple parts and exists or looks like system path)
-    if path_obj.is_absolute():
-        # If it starts with system root and has multiple parts, treat as absolute
-        if len(path_obj.parts) > 2 and (
-            path_obj.exists() or str(path_obj).startswith(("/", "C:", "D:"))
-        ):
-            return path_obj.resolve()
-        else:
-            # Treat as relative to project root (remove leading slash)
-            relative_part = str(path_obj).lstrip("/")
-            return (base_path / relative_part).resolve()
-    else:
-        # Regular relative path
-        return (base_path / input_path).resolve()
+        # Tree lines of this directory, each with the entry whose subtree
+        # follows it (None for files), and the prefixes of expanded subtrees
+        items_lines = []
+        tree_dirs = {}
+        error = None
+        if tree:
+            items = sorted(entries, key=lambda x: (x.is_file(), x.name.lower()))
+            for i, item in enumerate(items):
+                if tree_ignored(item.name):
+                    continue
+
+                is_last = i == len(items) - 1
+                current_prefix = "└── " if is_last else "├── "
+                next_prefix = "    " if is_last else "│   "
+
+                if item.is_dir():
+                    items_lines.append(
+                        (item.name, f"{prefix}{current_prefix}{item.name}/")
+                    )
+                    if depth + 1 <= max_depth:
+                        tree_dirs[item.name] = prefix + next_prefix
+                    continue
+
+                # Show file with size
+                try:
+                    size = item.stat().st_size
+                except PermissionError:
+                    items_lines.append((None, f"{prefix}└── [Permission Denied]"))
+                    break
+                except OSError as e:
+                    error = e
+                    break
+                size_str = format_file_size(size)
+                items_lines.append(
+                    (None, f"{prefix}{current_prefix}{item.name} ({size_str})")
+                )
+
+        # Descend in listing order so language files keep rglob's order
+        subtrees = {}
+        for entry in entries:
+            in_tree = entry.name in tree_dirs
+            if in_tree or entry.name in lang_dirs:
+                subtrees[entry.name] = visit(
+                    entry.path,
+                    tree_dirs.get(entry.name, ""),
+                    depth + 1,
+                    in_tree,
+                    entry.name in lang_dirs,
+                )
+
+        # Assemble in sorted order, stopping at the first error as the
+        # recursive tree builder did
+        lines = []
+        for name, line in items_lines:
+            lines.append(line)
+            if name in tree_dirs:
+                sub_lines, sub_error = subtrees[name]
+                lines.extend(sub_lines)
+                if sub_error is not None:
+                    return lines, sub_error
+        return lines, error
+
+    tree = tree_ignored is not None and max_depth >= 0
+    langs = language_ignored is not None
+    lines, error = visit(base_str, "", 0, tree, langs)
+    if tree:
+        scan.tree_lines = [f"{os.path.basename(base_str)}/", *lines]
+        scan.tree_error = error
+    return scan
+
+
+def _match_important(
+    entry: os.DirEntry, found_files: Dict[str, List[Tuple[str, int]]]
+) -> None:
+    """Record a project root entry under every important pattern it matches."""
+    if entry.name == ".github":
+        try:
+            if entry.is_dir():
+                found_files["CI/CD"].extend(_iter_tree_files(entry.path, entry.name))
+        except OSError:
+            pass
+        return
+
+    matches = _IMPORTANT_RE.match(entry.name).groups()
+    if not any(matches):
+        return
+
+    try:
+        if not entry.is_file():
+            return
+        size = entry.stat().st_size
+    except OSError:
+        return
+
+    for category, match in zip(_IMPORTANT_CATEGORIES, matches):
+        if match is not None:
+            found_files[category].append((entry.name, size))
+
+
+def _iter_tree_files(path: str, rel_path: str) -> Iterator[Tuple[str, int]]:
+    """Yield (relative path, size) of the files below path, like glob's '**/*'."""
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    for entry in entries:
+        try:
+            if entry.is_file():
+                yield os.path.join(rel_path, entry.name), entry.stat().st_size
+            elif entry.is_dir(follow_symlinks=False):
+                yield from _iter_tree_files(
+                    entry.path, os.path.join(rel_path, entry.name)
+                )
+        except OSError:
+            continue
+
+
+def _suffix(name: str) -> str:
+    """Return the lowercased final suffix of a file name, like Path.suffix."""
+    dot = name.rfind(".")
+    if 0 < dot < len(name) - 1:
+        return name[dot:].lower()
+    return ""
 
 
 def get_project_structure(
-    project_root: str = None, max_depth: int = 5, ignore_patterns: List[str] = None
+    project_root: str = None,
+    max_depth: int = 5,
+    ignore_patterns: List[str] = None,
+    _scan: Optional[ProjectScan] = None,
 ) -> str:
     """
     Get recursive project structure as a tree string.
@@ -101,73 +409,17 @@ def get_project_structure(
 
         # Default ignore patterns
         if ignore_patterns is None:
-            ignore_patterns = [
-                ".git",
-                ".gitignore",
-                "__pycache__",
-                ".pyc",
-                "node_modules",
-                ".DS_Store",
-                ".vscode",
-                ".idea",
-                "venv",
-                "env",
-                ".env",
-                "dist",
-                "build",
-            ]
-
-        def should_ignore(path: Path) -> bool:
-            """Check if path should be ignored."""
-            path_str = str(path)
-            path_name = path.name
-
-            for pattern in ignore_patterns:
-                if pattern in path_str or pattern in path_name:
-                    return True
-            return False
-
-        def build_tree(path: Path, prefix: str = "", depth: int = 0) -> List[str]:
-            """Build tree structure recursively."""
-            if depth > max_depth or should_ignore(path):
-                return []
-
-            lines = []
-            if depth == 0:
-                lines.append(f"{path.name}/")
-
-            try:
-                items = sorted(
-                    path.iterdir(), key=lambda x: (x.is_file(), x.name.lower())
-                )
+            ignore_patterns = _STRUCTURE_IGNORE_PATTERNS
 
-                for i, item in enumerate(items):
-                    if should_ignore(item):
-                        continue
-
-                    is_last = i == len(items) - 1
-                    current_prefix = "└── " if is_last else "├── "
-                    next_prefix = "    " if is_last else "│   "
-
-                    if item.is_dir():
-                        lines.append(f"{prefix}{current_prefix}{item.name}/")
-                        lines.extend(build_tree(item, prefix + next_prefix, depth + 1))
-                    else:
-                        # Show file with size
-                        size = item.stat().st_size
-                        size_str = format_file_size(size)
-                        lines.append(
-                            f"{prefix}{current_prefix}{item.name} ({size_str})"
-                        )
-
-            except PermissionError:
-                lines.append(f"{prefix}└── [Permission Denied]")
-
-            return lines
+        if _scan is None:
+            _scan = _walk_project(
+                str(base_path), max_depth=max_depth, structure_ignore=ignore_patterns
+            )
+        if _scan.tree_error is not None:
+            raise _scan.tree_error
 
-        tree_lines = build_tree(base_path)
         result = f"Project structure for: {base_path}\n{'='*50}\n"
-        result += "\n".join(tree_lines)
+        result += "\n".join(_scan.tree_lines)
 
         return result
 
@@ -176,7 +428,9 @@ def get_project_structure(
 
 
 def analyze_project_languages(
-    project_root: str = None, ignore_patterns: List[str] = None
+    project_root: str = None,
+    ignore_patterns: List[str] = None,
+    _scan: Optional[ProjectScan] = None,
 ) -> str:
     """
     Analyze programming languages and file types in the project.
@@ -196,88 +450,37 @@ def analyze_project_languages(
 
         # Default ignore patterns
         if ignore_patterns is None:
-            ignore_patterns = [
-                ".git",
-                "__pycache__",
-                "node_modules",
-                ".DS_Store",
-                "venv",
-                "env",
-                "dist",
-                "build",
-            ]
-
-        def should_ignore(path: Path) -> bool:
-            path_str = str(path)
-            for pattern in ignore_patterns:
-                if pattern in path_str:
-                    return True
-            return False
-
-        # Language mapping
-        language_map = {
-            ".py": "Python",
-            ".js": "JavaScript",
-            ".ts": "TypeScript",
-            ".jsx": "React JSX",
-            ".tsx": "React TSX",
-            ".html": "HTML",
-            ".css": "CSS",
-            ".scss": "SCSS",
-            ".sass": "Sass",
-            ".json": "JSON",
-            ".yml": "YAML",
-            ".yaml": "YAML",
-            ".md": "Markdown",
-            ".txt": "Text",
-            ".sh": "Shell Script",
-            ".sql": "SQL",
-            ".java": "Java",
-            ".cpp": "C++",
-            ".c": "C",
-            ".go": "Go",
-            ".rs": "Rust",
-            ".php": "PHP",
-            ".rb": "Ruby",
-            ".swift": "Swift",
-            ".kt": "Kotlin",
-            ".dart": "Dart",
-            ".r": "R",
-            ".scala": "Scala",
-            ".clj": "Clojure",
-            ".dockerfile": "Dockerfile",
-            ".env": "Environment",
-            ".toml": "TOML",
-            ".xml": "XML",
-            ".vue": "Vue.js",
-        }
-
-        file_stats = defaultdict(lambda: {"count": 0, "size": 0, "files": []})
+            ignore_patterns = _LANGUAGE_IGNORE_PATTERNS
+
+        if _scan is None:
+            _scan = _walk_project(str(base_path), language_ignore=ignore_patterns)
+
+        file_stats: Dict[str, LanguageStats] = {}
         total_files = 0
         total_size = 0
 
-        for file_path in base_path.rglob("*"):
-            if not file_path.is_file() or should_ignore(file_path):
-                continue
-
-            extension = file_path.suffix.lower()
-            file_size = file_path.stat().st_size
+        for rel_path, file_name, file_size in _scan.language_files:
+            extension = _suffix(file_name)
 
             # Special case for files without extension
-            if not extension and file_path.name.lower() in [
+            if not extension and file_name.lower() in [
                 "dockerfile",
                 "makefile",
                 "readme",
             ]:
-                extension = f".{file_path.name.lower()}"
+                extension = f".{file_name.lower()}"
 
-            language = language_map.get(
+            language = _LANGUAGE_MAP.get(
                 extension, f"Other ({extension})" if extension else "No Extension"
             )
 
-            file_stats[language]["count"] += 1
-            file_stats[language]["size"] += file_size
-            file_stats[language]["files"].append(str(file_path.relative_to(base_path)))
+            stats = file_stats.get(language)
+            if stats is None:
+                stats = file_stats[language] = LanguageStats()
+            stats.count += 1
+            stats.size += file_size
+            if len(stats.files) < _LANGUAGE_EXAMPLES:
+                stats.files.append(rel_path)
 
             total_files += 1
             total_size += file_size
@@ -287,36 +490,38 @@ def analyze_project_languages(
 
         # Sort by file count
         sorted_languages = sorted(
-            file_stats.items(), key=lambda x: x[1]["count"], reverse=True
+            file_stats.items(), key=lambda x: x[1].count, reverse=True
         )
 
-        result = f"Project language analysis for: {base_path}\n"
-        result += (
+        parts = [f"Project language analysis for: {base_path}\n"]
+        append = parts.append
+        append(
             f"Total files: {total_files}, Total size: {format_file_size(total_size)}\n"
         )
-        result += "=" * 50 + "\n\n"
+        append("=" * 50 + "\n\n")
 
         for language, stats in sorted_languages:
-            percentage = (stats["count"] / total_files) * 100
-            size_str = format_file_size(stats["size"])
-            result += f"{language}:\n"
-            result += f"  Files: {stats['count']} ({percentage:.1f}%)\n"
-            result += f"  Size: {size_str}\n"
+            percentage = (stats.count / total_files) * 100
+            size_str = format_file_size(stats.size)
+            append(f"{language}:\n")
+            append(f"  Files: {stats.count} ({percentage:.1f}%)\n")
+            append(f"  Size: {size_str}\n")
 
             # Show some example files (up to 5)
-            example_files = stats["files"][:5]
-            result += f"  Examples: {', '.join(example_files)}"
-            if len(stats["files"]) > 5:
-                result += f" (and {len(stats['files']) - 5} more)"
-            result += "\n\n"
+            append(f"  Examples: {', '.join(stats.files)}")
+            if stats.count > _LANGUAGE_EXAMPLES:
+                append(f" (and {stats.count - _LANGUAGE_EXAMPLES} more)")
+            append("\n\n")
 
-        return result
+        return "".join(parts)
 
     except Exception as e:
         return f"Error analyzing project languages: {str(e)}"
 
 
-def get_important_files(project_root: str = None) -> str:
+def get_important_files(
+    project_root: str = None, _scan: Optional[ProjectScan] = None
+) -> str:
     """
     Identify and analyze important project files (README, config files, etc.).
 
@@ -332,75 +537,38 @@ def get_important_files(project_root: str = None) -> str:
         if not base_path.exists():
             return f"Error: Directory '{base_path}' does not exist"
 
-        important_patterns = {
-            "Documentation": [
-                "readme*",
-                "changelog*",
-                "license*",
-                "authors*",
-                "contributors*",
-            ],
-            "Configuration": [
-                "*.json",
-                "*.yml",
-                "*.yaml",
-                "*.toml",
-                "*.ini",
-                "*.cfg",
-                ".env*",
-            ],
-            "Build/Deploy": [
-                "makefile",
-                "dockerfile*",
-                "*.sh",
-                "requirements.txt",
-                "package.json",
-                "setup.py",
-                "pyproject.toml",
-            ],
-            "Version Control": [".gitignore", ".gitattributes"],
-            "CI/CD": [".github/**/*", ".gitlab-ci.yml", "jenkinsfile*", "*.yml"],
-        }
-
-        found_files = defaultdict(list)
-
-        for category, patterns in important_patterns.items():
-            for pattern in patterns:
-                for file_path in base_path.glob(pattern):
-                    if file_path.is_file():
-                        relative_path = file_path.relative_to(base_path)
-                        file_size = file_path.stat().st_size
-                        found_files[category].append(
-                            {
-                                "path": str(relative_path),
-                                "size": file_size,
-                                "full_path": file_path,
-                            }
-                        )
+        if _scan is None:
+            _scan = _walk_project(str(base_path), important=True)
+        found_files = _scan.important_files
 
         if not found_files:
             return f"No important files found in project '{base_path}'"
 
-        result = f"Important files in project: {base_path}\n{'='*50}\n\n"
+        parts = [f"Important files in project: {base_path}\n{'='*50}\n\n"]
+        append = parts.append
 
-        for category, files in found_files.items():
+        for category in _IMPORTANT_PATTERNS:
+            files = found_files.get(category)
             if files:
-                result += f"{category}:\n"
-                for file_info in sorted(files, key=lambda x: x["path"]):
-                    size_str = format_file_size(file_info["size"])
-                    result += f"  - {file_info['path']} ({size_str})\n"
-                result += "\n"
+                append(f"{category}:\n")
+                for path, size in sorted(files, key=lambda x: x[0]):
+                    size_str = format_file_size(size)
+                    append(f"  - {path} ({size_str})\n")
+                append("\n")
 
-        return result
+        return "".join(parts)
 
     except Exception as e:
         return f"Error analyzing important files: {str(e)}"
 
 
+@lru_cache(maxsize=1024)
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     if size_bytes == 0:
         return "0 B"
+    if 0 < size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
 
     size_names = ["B", "KB", "MB", "GB"]
     i = 0
@@ -426,14 +594,26 @@ def get_project_summary(project_root: str = None) -> str:
     try:
         base_path = resolve_project_path(project_root or ".", None)
 
-        result = f"COMPREHENSIVE PROJECT SUMMARY\n"
-        result += f"Project: {base_path}\n"
-        result += "=" * 60 + "\n\n"
+        parts = ["COMPREHENSIVE PROJECT SUMMARY\n"]
+        append = parts.append
+        append(f"Project: {base_path}\n")
+        append("=" * 60 + "\n\n")
+
+        # One walk feeds all three sections
+        scan = _walk_project(
+            str(base_path),
+            max_depth=3,  # Limit depth for summary
+            structure_ignore=_STRUCTURE_IGNORE_PATTERNS,
+            language_ignore=_LANGUAGE_IGNORE_PATTERNS,
+            important=True,
+        )
+        lang_analysis = analyze_project_languages(str(base_path), _scan=scan)
+        important_files = get_important_files(str(base_path), _scan=scan)
+        structure = get_project_structure(str(base_path), max_depth=3, _scan=scan)
 
         # 1. Language Analysis
-        result += "1. LANGUAGE ANALYSIS:\n"
-        result += "-" * 30 + "\n"
-        lang_analysis = analyze_project_languages(str(base_path))
+        append("1. LANGUAGE ANALYSIS:\n")
+        append("-" * 30 + "\n")
         if not lang_analysis.startswith("Error"):
             # Extract just the stats part
             lines = lang_analysis.split("\n")
@@ -445,15 +625,14 @@ def get_project_summary(project_root: str = None) -> str:
                     stats_start = True
                     continue
                 if stats_start and line.strip():
-                    result += line + "\n"
+                    append(line + "\n")
         else:
-            result += lang_analysis + "\n"
-        result += "\n"
+            append(lang_analysis + "\n")
+        append("\n")
 
         # 2. Important Files
-        result += "2. IMPORTANT FILES:\n"
-        result += "-" * 30 + "\n"
-        important_files = get_important_files(str(base_path))
+        append("2. IMPORTANT FILES:\n")
+        append("-" * 30 + "\n")
         if not important_files.startswith("Error"):
             # Extract just the files part
             lines = important_files.split("\n")
@@ -463,17 +642,14 @@ def get_project_summary(project_root: str = None) -> str:
                     files_start = True
                     continue
                 if files_start and line.strip():
-                    result += line + "\n"
+                    append(line + "\n")
         else:
-            result += important_files + "\n"
-        result += "\n"
+            append(important_files + "\n")
+        append("\n")
 
         # 3. Directory Structure (simplified)
-        result += "3. PROJECT STRUCTURE:\n"
-        result += "-" * 30 + "\n"
-        structure = get_project_structure(
-            str(base_path), max_depth=3
-        )  # Limit depth for summary
+        append("3. PROJECT STRUCTURE:\n")
+        append("-" * 30 + "\n")
         if not structure.startswith("Error"):
             # Extract just the tree part
             lines = structure.split("\n")
@@ -483,11 +659,11 @@ def get_project_summary(project_root: str = None) -> str:
                     tree_start = True
                     continue
                 if tree_start:
-                    result += line + "\n"
+                    append(line + "\n")
         else:
-            result += structure + "\n"
+            append(structure + "\n")
 
-        return result
+        return "".join(parts)
 
     except Exception as e:
         return f"Error creating project summary: {str(e)}"
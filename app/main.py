@@ -4,22 +4,42 @@ Main entry point for the AI Coding Agent package.
 This module provides the same functionality as the root main.py but as part of the package.
 """
 
+import argparse
 import sys
 from pathlib import Path
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options before anything heavy is imported."""
+    parser = argparse.ArgumentParser(
+        prog="ai-coding-agent",
+        description="AI-powered coding assistant with terminal UI",
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main entry point for the application."""
+    # --help exits here, without waiting for the UI imports
+    parse_args()
+
     try:
         print("Starting AI Coding Agent...")
 
         # Load environment variables
         print("Loading environment...")
 
-        # Add the project root to the Python path
+        # Add the project root to the Python path, which only a plain
+        # `python app/main.py` lacks; `python -m app.main` and the installed
+        # scripts already import the package from it
         print("Setting up paths...")
-        project_root = Path(__file__).parent.parent
-        sys.path.insert(0, str(project_root))
+        if not __package__:
+            project_root = Path(__file__).parent.parent
+            sys.path.insert(0, str(project_root))
+
+        from app.core.config import configure_logging
+
+        configure_logging()
 
         print("Importing UI...")
         from app.ui.welcome_screen import WelcomeApp
@@ -3,14 +3,35 @@ Agent and conversation models for storing AI interactions in SQLite.
 """
 
 from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Index, insert, inspect, update
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
-from sqlalchemy.orm import Session, relationship
+from sqlalchemy.orm import Session, load_only, object_session, relationship
 from typing import List, Dict, Any, Optional
 import json
 
+try:
+    import orjson
+except ImportError:  # Optional: metadata falls back to the json module
+    orjson = None
+
 from app.core.database import Base
 
 
+def _dump_metadata(metadata: Dict[str, Any]) -> str:
+    """Serialize message metadata to the JSON text stored in the column."""
+    if orjson is not None:
+        return orjson.dumps(metadata).decode()
+    return json.dumps(metadata)
+
+
+def _load_metadata(text: str) -> Dict[str, Any]:
+    """Parse stored metadata; orjson.JSONDecodeError subclasses json's."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
 class AgentSession(Base):
     """Model for storing agent conversation sessions."""
     
@@ -26,11 +47,17 @@ class AgentSession(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    # Relationship to messages
-    messages = relationship("AgentMessage", back_populates="session", cascade="all, delete-orphan")
+    # Relationship to messages, oldest first
+    messages = relationship(
+        "AgentMessage",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        order_by="[AgentMessage.created_at, AgentMessage.id]",
+        lazy="select"
+    )
     
     def __repr__(self):
-        return f"<AgentSession(id={self.id}, model={self.model_used}, messages={len(self.messages)})>"
+        return f"<AgentSession(id={self.id}, model={self.model_used}, messages={self.count_messages()})>"
     
     @classmethod
     def create_session(cls, db: Session, user_id: int, model: str, title: str = None) -> 'AgentSession':
@@ -48,45 +75,129 @@ class AgentSession(Base):
     @classmethod
     def get_user_sessions(cls, db: Session, user_id: int, limit: int = 10) -> List['AgentSession']:
         """Get recent sessions for a user."""
-        return db.query(cls).filter(
+        # Only the columns session lists and get_summary show
+        return db.query(cls).options(
+            load_only(
+                cls.id,
+                cls.title,
+                cls.model_used,
+                cls.created_at,
+                cls.updated_at,
+                cls.is_active
+            )
+        ).filter(
             cls.user_id == user_id
         ).order_by(cls.updated_at.desc()).limit(limit).all()
     
     def add_message(self, db: Session, role: str, content: str, metadata: Dict[str, Any] = None) -> 'AgentMessage':
         """Add a message to this session."""
-        message = AgentMessage(
-            session_id=self.id,
-            role=role,
-            content=content,
-            message_metadata=json.dumps(metadata) if metadata else None
-        )
-        db.add(message)
-        db.commit()
-        db.refresh(message)
+        return self.add_messages(db, [
+            {"role": role, "content": content, "metadata": metadata}
+        ])[0]
+    
+    def add_messages(self, db: Session, messages: List[Dict[str, Any]]) -> List['AgentMessage']:
+        """
+        Add messages to this session in one INSERT and one commit. Each
+        message is a dict with role, content and optional metadata.
+        """
+        # Written with Core statements, which skip the ORM unit of work for
+        # this write-only path; commit expires self, so self.messages
+        # reloads with the new rows on next access
+        session_id = self.id
+        rows = [
+            {
+                "session_id": session_id,
+                "role": message["role"],
+                "content": message["content"],
+                "message_metadata": _dump_metadata(message["metadata"]) if message.get("metadata") else None
+            }
+            for message in messages
+        ]
+        if not db.get_bind().dialect.insert_returning:
+            # SQLite before 3.35 has no INSERT ... RETURNING; let the ORM
+            # insert the rows and fetch their ids instead
+            added = [AgentMessage(**values) for values in rows]
+            db.add_all(added)
+            db.flush()
+            self._touch(db, session_id)
+            db.commit()
+            return added
         
-        # Update session timestamp
-        self.updated_at = func.now()
+        inserted = db.execute(
+            insert(AgentMessage).returning(
+                AgentMessage.id,
+                AgentMessage.created_at,
+                sort_by_parameter_order=True
+            ),
+            rows
+        ).all()
+        self._touch(db, session_id)
         db.commit()
         
-        return message
+        # Detached copies of the new rows for callers, in the given order
+        return [
+            AgentMessage(id=row.id, created_at=row.created_at, **values)
+            for row, values in zip(inserted, rows)
+        ]
+    
+    @staticmethod
+    def _touch(db: Session, session_id: int) -> None:
+        """Update a session's timestamp in the current transaction."""
+        db.execute(
+            update(AgentSession)
+            .where(AgentSession.id == session_id)
+            .values(updated_at=func.now())
+        )
     
-    def get_conversation_history(self) -> List[Dict[str, str]]:
+    def _message_query(self, db: Optional[Session], *entities):
+        """
+        Query entities of this session's messages. None when self.messages
+        is already loaded (e.g. by selectinload) or the object is detached,
+        and the callers read the collection instead.
+        """
+        if "messages" not in inspect(self).unloaded:
+            return None
+        db = db or object_session(self)
+        if db is None:
+            return None
+        return db.query(*entities).filter(AgentMessage.session_id == self.id)
+    
+    def get_messages(self, db: Session = None) -> List['AgentMessage']:
+        """Get this session's messages oldest first, ordered by the database."""
+        query = self._message_query(db, AgentMessage)
+        if query is None:
+            return list(self.messages)
+        return query.order_by(AgentMessage.created_at, AgentMessage.id).all()
+    
+    def count_messages(self, db: Session = None) -> int:
+        """Count this session's messages without loading them."""
+        query = self._message_query(db, func.count(AgentMessage.id))
+        if query is None:
+            return len(self.messages)
+        return query.scalar()
+    
+    def get_conversation_history(self, db: Session = None) -> List[Dict[str, str]]:
         """Get conversation history in format for AI service."""
+        query = self._message_query(db, AgentMessage.role, AgentMessage.content)
+        if query is None:
+            rows = self.messages
+        else:
+            rows = query.order_by(AgentMessage.created_at, AgentMessage.id).all()
         return [
             {
                 "role": msg.role,
                 "content": msg.content
             }
-            for msg in sorted(self.messages, key=lambda x: x.created_at)
+            for msg in rows
         ]
     
-    def get_summary(self) -> Dict[str, Any]:
+    def get_summary(self, db: Session = None) -> Dict[str, Any]:
         """Get session summary."""
         return {
             "id": self.id,
             "title": self.title or f"Session {self.id}",
             "model": self.model_used,
-            "message_count": len(self.messages),
+            "message_count": self.count_messages(db),
             "created_at": self.created_at,
             "updated_at": self.updated_at,
             "is_active": self.is_active
@@ -97,6 +208,10 @@ class AgentMessage(Base):
     """Model for storing individual messages in agent conversations."""
     
     __tablename__ = "agent_messages"
+    __table_args__ = (
+        # Serves the ordered history reads of one session
+        Index("ix_agentmessage_session_created", "session_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("agent_sessions.id"), nullable=False)
@@ -114,11 +229,62 @@ class AgentMessage(Base):
         preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
         return f"<AgentMessage(role={self.role}, content='{preview}')>"
     
+    # Metadata keys readable on a message or, through SQLite's JSON1
+    # json_extract, in a query without loading and parsing the column
+    @hybrid_property
+    def model(self) -> Optional[str]:
+        """Model that wrote this message, if recorded."""
+        return self.get_metadata().get("model")
+    
+    @model.expression
+    def model(cls):
+        return func.json_extract(cls.message_metadata, "$.model")
+    
+    @hybrid_property
+    def prompt_tokens(self) -> Optional[int]:
+        """Prompt tokens of the AI call behind this message, if recorded."""
+        return (self.get_metadata().get("usage") or {}).get("prompt_tokens")
+    
+    @prompt_tokens.expression
+    def prompt_tokens(cls):
+        return func.json_extract(cls.message_metadata, "$.usage.prompt_tokens")
+    
+    @hybrid_property
+    def completion_tokens(self) -> Optional[int]:
+        """Completion tokens of the AI call behind this message, if recorded."""
+        return (self.get_metadata().get("usage") or {}).get("completion_tokens")
+    
+    @completion_tokens.expression
+    def completion_tokens(cls):
+        return func.json_extract(cls.message_metadata, "$.usage.completion_tokens")
+    
+    @classmethod
+    def get_session_usage(cls, db: Session, session_id: int) -> List[Dict[str, Any]]:
+        """Get model and token usage of a session's AI responses, oldest first."""
+        rows = db.query(
+            cls.id,
+            cls.model,
+            cls.prompt_tokens,
+            cls.completion_tokens
+        ).filter(
+            cls.session_id == session_id,
+            cls.role == "assistant"
+        ).order_by(cls.created_at, cls.id).all()
+        return [
+            {
+                "id": message_id,
+                "model": model,
+                "prompt_tokens": prompt_tokens or 0,
+                "completion_tokens": completion_tokens or 0
+            }
+            for message_id, model, prompt_tokens, completion_tokens in rows
+        ]
+    
     def get_metadata(self) -> Dict[str, Any]:
         """Get parsed metadata."""
         if self.message_metadata:
             try:
-                return json.loads(self.message_metadata)
+                return _load_metadata(self.message_metadata)
             except json.JSONDecodeError:
                 return {}
         return {}
@@ -2,12 +2,19 @@
 User model for storing user settings and API configuration.
 """
 
+import logging
+
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Session
 from typing import Optional, Tuple
 from app.core.database import Base
 
+logger = logging.getLogger(__name__)
+
+# Id of the default user, looked up once per process
+_default_user_id: Optional[int] = None
+
 
 class User(Base):
     """User model for storing user configuration."""
@@ -34,6 +41,13 @@ class User(Base):
     @classmethod
     def get_or_create_default_user(cls, db: Session) -> 'User':
         """Get existing default user or create one."""
+        global _default_user_id
+        if _default_user_id is not None:
+            # By primary key, served from the session's identity map when loaded
+            user = db.get(cls, _default_user_id)
+            if user:
+                return user
+
         user = db.query(cls).filter(cls.username == "default_user").first()
 
         if not user:
@@ -47,8 +61,22 @@ class User(Base):
             db.add(settings)
             db.commit()
 
+        _default_user_id = user.id
         return user
 
+    @classmethod
+    def get_default_user_id(cls, db: Session) -> int:
+        """Get the default user's id, creating the user on first use."""
+        if _default_user_id is not None:
+            return _default_user_id
+        return cls.get_or_create_default_user(db).id
+
+    @classmethod
+    def forget_default_user(cls) -> None:
+        """Drop the cached default user id, e.g. after the users table is rebuilt."""
+        global _default_user_id
+        _default_user_id = None
+
     @classmethod
     def get_default_user(cls, db: Session) -> Optional['User']:
         """Get the default user if exists."""
@@ -76,8 +104,8 @@ class User(Base):
             db.commit()
             return True
 
-        except Exception as e:
-            print(f"❌ Error saving configuration: {e}")
+        except Exception:
+            logger.exception("Error saving configuration")
             db.rollback()
             return False
 
@@ -177,7 +205,7 @@ class UserSettings(Base):
             db.commit()
             return True
 
-        except Exception as e:
-            print(f"❌ Error updating settings: {e}")
+        except Exception:
+            logger.exception("Error updating settings")
             db.rollback()
             return False
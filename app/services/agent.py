@@ -3,7 +3,7 @@ Agent class that combines AI service with conversation management and storage.
 """
 
 from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.services.ai_service import AIService
 from app.models.agent import AgentSession, AgentMessage
@@ -20,30 +20,39 @@ class Agent:
         self.db = db_session
         self.ai_service = AIService(db_session)
         self.current_session: Optional[AgentSession] = None
+        # Gemini chat history of current_session, extended as messages are
+        # saved; None until built from the database
+        self._chat_history: Optional[List[Dict[str, Any]]] = None
 
     def start_new_session(self, title: str = None) -> AgentSession:
         """Start a new conversation session."""
-        user = User.get_or_create_default_user(self.db)
+        user_id = User.get_default_user_id(self.db)
         model = self.ai_service.get_current_model()
 
         self.current_session = AgentSession.create_session(
-            db=self.db, user_id=user.id, model=model, title=title
+            db=self.db, user_id=user_id, model=model, title=title
         )
+        self._chat_history = []
         return self.current_session
 
     def load_session(self, session_id: int) -> Optional[AgentSession]:
         """Load an existing conversation session."""
+        # Messages come with the session, for the first history read
         session = (
-            self.db.query(AgentSession).filter(AgentSession.id == session_id).first()
+            self.db.query(AgentSession)
+            .options(selectinload(AgentSession.messages))
+            .filter(AgentSession.id == session_id)
+            .first()
         )
         if session:
             self.current_session = session
+            self._chat_history = None
         return session
 
     def get_user_sessions(self, limit: int = 10) -> List[AgentSession]:
         """Get recent sessions for the current user."""
-        user = User.get_or_create_default_user(self.db)
-        return AgentSession.get_user_sessions(self.db, user.id, limit)
+        user_id = User.get_default_user_id(self.db)
+        return AgentSession.get_user_sessions(self.db, user_id, limit)
 
     async def send_message(
         self, message: str, save_to_db: bool = True
@@ -64,13 +73,13 @@ class Agent:
                 self.start_new_session()
 
             # Get conversation history if we have an active session
-            conversation_history = []
+            chat_history = []
             if self.current_session:
-                conversation_history = self.current_session.get_conversation_history()
+                chat_history = self._get_chat_history()
 
             # Send message to AI
             ai_response = await self.ai_service.send_message(
-                message, conversation_history
+                message, chat_history=chat_history
             )
 
             if not ai_response["success"]:
@@ -84,21 +93,22 @@ class Agent:
 
             # Save to database if requested and session exists
             if save_to_db and self.current_session:
-                # Save user message
-                user_msg = self.current_session.add_message(
-                    db=self.db, role="user", content=message
-                )
-
-                # Save AI response
-                ai_msg = self.current_session.add_message(
-                    db=self.db,
-                    role="assistant",
-                    content=ai_response["response"],
-                    metadata={
-                        "model": ai_response["model"],
-                        "usage": ai_response.get("usage", {}),
-                    },
+                # Save user message and AI response together
+                user_msg, ai_msg = self.current_session.add_messages(
+                    self.db,
+                    [
+                        {"role": "user", "content": message},
+                        {
+                            "role": "assistant",
+                            "content": ai_response["response"],
+                            "metadata": {
+                                "model": ai_response["model"],
+                                "usage": ai_response.get("usage", {}),
+                            },
+                        },
+                    ],
                 )
+                self._extend_chat_history(message, ai_response["response"])
 
             return {
                 "success": True,
@@ -153,26 +163,31 @@ class Agent:
 
             # Save to database if requested and session exists
             if save_to_db and self.current_session:
-                # Save combined message (system + user)
+                # Save combined message (system + user) and AI response together
                 combined_message = f"System: {system_prompt}\n\nUser: {user_message}"
-                user_msg = self.current_session.add_message(
-                    db=self.db,
-                    role="user",
-                    content=combined_message,
-                    metadata={"type": "system_message", "system_prompt": system_prompt},
-                )
-
-                # Save AI response
-                ai_msg = self.current_session.add_message(
-                    db=self.db,
-                    role="assistant",
-                    content=ai_response["response"],
-                    metadata={
-                        "model": ai_response["model"],
-                        "usage": ai_response.get("usage", {}),
-                        "type": "system_response",
-                    },
+                user_msg, ai_msg = self.current_session.add_messages(
+                    self.db,
+                    [
+                        {
+                            "role": "user",
+                            "content": combined_message,
+                            "metadata": {
+                                "type": "system_message",
+                                "system_prompt": system_prompt,
+                            },
+                        },
+                        {
+                            "role": "assistant",
+                            "content": ai_response["response"],
+                            "metadata": {
+                                "model": ai_response["model"],
+                                "usage": ai_response.get("usage", {}),
+                                "type": "system_response",
+                            },
+                        },
+                    ],
                 )
+                self._extend_chat_history(combined_message, ai_response["response"])
 
             return {
                 "success": True,
@@ -192,12 +207,32 @@ class Agent:
                 "session_id": self.current_session.id if self.current_session else None,
             }
 
+    def _get_chat_history(self) -> List[Dict[str, Any]]:
+        """Get the current session's chat history, formatting it only once."""
+        if self._chat_history is None:
+            self._chat_history = self.ai_service.format_history(
+                self.current_session.get_conversation_history(self.db)
+            )
+        return self._chat_history
+
+    def _extend_chat_history(self, user_content: str, ai_content: str) -> None:
+        """Append a saved user message and AI response to the chat history."""
+        if self._chat_history is None:
+            return
+        self._chat_history.append(
+            self.ai_service.format_history_message("user", user_content)
+        )
+        self._chat_history.append(
+            self.ai_service.format_history_message("assistant", ai_content)
+        )
+
     def get_session_messages(self, session_id: int = None) -> List[Dict[str, Any]]:
         """Get messages from a session (current session if no ID provided)."""
         session = None
         if session_id:
             session = (
                 self.db.query(AgentSession)
+                .options(selectinload(AgentSession.messages))
                 .filter(AgentSession.id == session_id)
                 .first()
             )
@@ -207,10 +242,7 @@ class Agent:
         if not session:
             return []
 
-        return [
-            msg.to_dict()
-            for msg in sorted(session.messages, key=lambda x: x.created_at)
-        ]
+        return [msg.to_dict() for msg in session.get_messages(self.db)]
 
     def delete_session(self, session_id: int) -> bool:
         """Delete a conversation session and all its messages."""
@@ -227,6 +259,7 @@ class Agent:
                 # Clear current session if it was deleted
                 if self.current_session and self.current_session.id == session_id:
                     self.current_session = None
+                    self._chat_history = None
 
                 return True
             return False
@@ -4,7 +4,7 @@ Handles API key management, model selection, and message formatting.
 """
 
 import google.generativeai as genai
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 
 from app.models.user import User
@@ -18,9 +18,14 @@ class AIService:
         self.db = db_session
         self._client = None
         self._current_model = None
+        # User's (api_key, model), cleared by refresh_config
+        self._cached_config: Optional[tuple[str, str]] = None
 
     def _get_user_config(self) -> tuple[str, str]:
         """Get user's API key and selected model."""
+        if self._cached_config is not None:
+            return self._cached_config
+
         user = User.get_or_create_default_user(self.db)
 
         api_key = user.gemini_api_key or settings.gemini_api_key
@@ -28,7 +33,8 @@ class AIService:
             raise ValueError("No valid API key found. Please run /setup first.")
 
         model = user.selected_model or "gemini-2.0-flash-exp"
-        return api_key, model
+        self._cached_config = (api_key, model)
+        return self._cached_config
 
     def _initialize_client(self) -> None:
         """Initialize the Gemini client with user configuration."""
@@ -41,8 +47,26 @@ class AIService:
         self._client = genai.GenerativeModel(model)
         self._current_model = model
 
+    @staticmethod
+    def format_history_message(role: str, content: str) -> Dict[str, Any]:
+        """Format one conversation message as a Gemini chat history entry."""
+        return {"role": "user" if role == "user" else "model", "parts": [content]}
+
+    @classmethod
+    def format_history(
+        cls, conversation_history: List[Dict[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """Format conversation messages as Gemini chat history."""
+        return [
+            cls.format_history_message(msg["role"], msg["content"])
+            for msg in conversation_history
+        ]
+
     async def send_message(
-        self, message: str, conversation_history: List[Dict[str, str]] = None
+        self,
+        message: str,
+        conversation_history: List[Dict[str, str]] = None,
+        chat_history: List[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Send a message to the AI and get response.
@@ -50,6 +74,8 @@ class AIService:
         Args:
             message: User message to send
             conversation_history: Previous messages in format [{"role": "user/assistant", "content": "..."}]
+            chat_history: Previous messages already formatted by format_history;
+                used instead of conversation_history when given
 
         Returns:
             Dict with response data
@@ -59,11 +85,8 @@ class AIService:
                 self._initialize_client()
 
             # Format conversation history for Gemini
-            chat_history = []
-            if conversation_history:
-                for msg in conversation_history:
-                    role = "user" if msg["role"] == "user" else "model"
-                    chat_history.append({"role": role, "parts": [msg["content"]]})
+            if chat_history is None:
+                chat_history = self.format_history(conversation_history or [])
 
             # Start chat with history
             chat = self._client.start_chat(history=chat_history)
@@ -121,3 +144,4 @@ class AIService:
         """Refresh the client configuration (useful after model changes)."""
         self._client = None
         self._current_model = None
+        self._cached_config = None
@@ -4,6 +4,7 @@ Main entry point for the AI Coding Agent.
 Starts the Textual UI welcome screen.
 """
 
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -21,6 +22,10 @@ def main():
         project_root = Path(__file__).parent
         sys.path.insert(0, str(project_root))
 
+        from app.core.config import configure_logging
+
+        configure_logging()
+
         print("Importing UI...")
         from app.ui.welcome_screen import WelcomeApp
 
@@ -40,4 +45,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed for process pools (directory code analysis) in frozen binaries
+    multiprocessing.freeze_support()
     main()